@@ -1,18 +1,220 @@
-from typing import List
-
+import asyncio
+import calendar
+import hashlib
+import re
+import string
+from datetime import date, datetime
+from typing import AsyncGenerator, List, Optional, Set, Type
+
+import numpy as np
 import pandas as pd
+from cachetools import LRUCache, TTLCache
+from dateutil import parser as date_parser
 from fredapi import Fred
 
-from backend.config.config import logger, DEFAULT_REGION, make_instructor_call, call_llm
+from backend.config.config import logger, DEFAULT_REGION, ANALYSIS_LLM_MODEL, FRED_SEARCH_LIMIT, FRED_SEARCH_TOP_K, \
+    FRED_RERANK_TOP_K, amake_instructor_call, astream_instructor_call, acall_llm, get_embeddings_batch
 from backend.schemas import QueryMetadata, SeriesMapping, SeriesSelection, EconomicAnalysis, \
-    SeriesEnhancement, GetDateRequests
+    SeriesEnhancement, GetDateRequest, GetDateRequests, Period, QueryMetadataWithDates, SeriesInfoLite
 from backend.vector_db import VectorDBManager
 
+# Repeated queries are common in chat, so LLM results are memoized per normalized query
+_query_metadata_cache: LRUCache = LRUCache(maxsize=1024)
+_date_requests_cache: LRUCache = LRUCache(maxsize=1024)
+_search_query_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+_series_selection_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query for use as a cache key, so case and surrounding whitespace don't miss the cache"""
+    return query.strip().lower()
+
+
+def _cache_key(*parts: str) -> str:
+    """Build a stable cache key from the given query components"""
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+# Columns read from FRED search results and the values used when a column is missing or empty
+_FRED_RESULT_COLUMNS = ['id', 'title', 'notes', 'frequency', 'units', 'seasonal_adjustment', 'last_updated', 'group_id']
+_FRED_RESULT_DEFAULTS = {
+    'notes': '',
+    'frequency': 'Unknown',
+    'units': 'Unknown',
+    'last_updated': 'Unknown',
+    'group_id': 'Unknown',
+}
+
+_DATE_RANGE_INSTRUCTIONS = """
+        Extract start and end dates from the query. Follow these rules:
+
+        1. For relative periods (e.g., "last 10 years"):
+           - Start date: Use appropriate period (day/week/month/year) with duration
+           - End date: Use period="current"
+
+        2. For exact date ranges (e.g., "between Oct 12 2020 and Nov 19 2023"):
+           - Both dates: Use period="exact" with exact_date in MM-DD-YYYY format
+
+        3. For single point references (e.g., "as of January 2023"):
+           - Both dates: Use period="exact" with same exact_date
+
+        4. Always ensure dates are properly formatted (MM-DD-YYYY for exact dates)
+        """
+
+
+# Prompt templates are built once, constants are baked in and only per-query values are substituted
+_METADATA_TMPL = string.Template(
+    "Analyze this economic assets query: '$query'\n"
+    "Extract the region and main economic concept.\n Make sure to convert region to standard format/proper names. "
+    "For example, 'US' should be converted to 'United States', 'Eurozone' to 'European Union', etc."
+    f"If region isn't specified, default to '{DEFAULT_REGION}'."
+)
+_METADATA_WITH_DATES_TMPL = string.Template(
+    _METADATA_TMPL.template
+    + f"\nAlso fill start_date_request and end_date_request.{_DATE_RANGE_INSTRUCTIONS}"
+)
+_SERIES_SELECTION_TMPL = string.Template(
+    "Analyze these FRED series for the concept '$concept' in $region:\n"
+    "$series"
+)
+_ENHANCEMENT_TMPL = string.Template(
+    "Analyze this FRED economic assets series and provide structured information:\n\n"
+    "Title: $title\n"
+    "Original Description: $notes\n"
+    "Units: $units\n"
+    "Frequency: $frequency\n"
+    "Context Query: $context_query\n\n"
+    "Provide a comprehensive analysis including:\n"
+    "1. A clear description of what this series measures\n"
+    "2. Common use cases in economic analysis\n"
+    "3. Related economic concepts\n"
+    "4. Relevant search keywords\n"
+    "5. The primary economic category"
+)
+_SEARCH_QUERY_TMPL = string.Template("""Given:
+        Original Query: $user_query
+        Economic Concept: $concept
+        Region: $region
+
+        Create a search query optimized for the FRED database.
+        Consider:
+        1. Technical economic terms
+        2. Unpack Standard abbreviations (e.g., 'CPI' to 'Consumer Price Index')
+        3. Regional identifiers. Use standard names (e.g., 'United States' instead of 'US', "European Union" instead of "Eurozone")
+        4. Category terms
+        5. Combine alternate phrasings, for example, 'unemployment rate / jobless rate' or "Inflation (CPI)"
+        6. Combine various regional identifiers (e.g., 'US / United States /USA' or 'Eurozone / European Union / Europe')
+
+        Return only the optimized search terms, no explanation.""")
+_ANALYSIS_TMPL = string.Template(
+    "Create a natural response for:\n"
+    "Query: $user_query\n"
+    "Region: $region:\n"
+    "Series: $title\n"
+    "Latest Value: $latest_value\n"
+    "Time Range: $start to $end\n"
+    "Provide structured analysis including latest value, trend, and key observations.\n"
+    "Focus on answering the query directly with relevant context."
+)
+
+# Upper bound on candidates listed in a selection prompt, prompt length dominates LLM latency
+MAX_SELECTION_CANDIDATES = 10
+
+
+# Common date phrasings that are resolved without an LLM call
+_LAST_PERIOD_PATTERN = re.compile(r"last (\d+) (day|week|month|year)s?", re.I)
+_BETWEEN_PATTERN = re.compile(r"between (.+?) and (.+)", re.I)
+_AS_OF_PATTERN = re.compile(r"as of (.+)", re.I)
+_SINCE_PATTERN = re.compile(r"since (.+)", re.I)
+_MONTH_NAMES = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+# A date leading the captured text, it must have a month name or a 4-digit year. Bare numbers
+# ('between 3 and 4 percent', 'since 2 years ago') and quarters ('q3 2023') are left to the LLM
+_EXACT_DATE_PATTERN = re.compile(
+    rf"(?:(?P<day_first>\d{{1,2}})(?:st|nd|rd|th)?\s+)?(?P<month>{_MONTH_NAMES})\b\.?"
+    r"(?:\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?\b,?)?(?:\s+(?P<month_year>\d{4})\b)?"
+    r"|(?P<full_date>\d{1,2}/\d{1,2}/\d{4}\b|\d{4}-\d{1,2}-\d{1,2}\b)"
+    r"|(?P<year>\d{4})(?![\w%])",
+    re.I
+)
+
+
+def _match_date(text: str) -> Optional[re.Match]:
+    """Match the date leading text, e.g. 'Oct 12 2020', 'January', '2020' or '03/15/2022'"""
+    return _EXACT_DATE_PATTERN.match(text.strip())
+
+
+def _date_year(match: re.Match) -> Optional[int]:
+    """Year given in a matched date, None when the date names only a month and day"""
+    if match["full_date"]:
+        return date_parser.parse(match["full_date"]).year
+    year = match["year"] or match["month_year"]
+    return int(year) if year else None
+
+
+def _resolve_date(match: re.Match, year: int, end_of_period: bool = False) -> date:
+    """
+    Resolve a matched date, taking year when the date has none. A year or month without a day
+    resolves to its first day, or to its last day when the date ends a range.
+    """
+    if match["full_date"]:
+        return date_parser.parse(match["full_date"]).date()
+    if match["year"]:
+        return date(year, 12, 31) if end_of_period else date(year, 1, 1)
+
+    month = datetime.strptime(match["month"][:3], "%b").month
+    if day := match["day_first"] or match["day"]:
+        return date(year, month, int(day))
+    return date(year, month, calendar.monthrange(year, month)[1] if end_of_period else 1)
+
+
+def _exact_date_request(day: date) -> GetDateRequest:
+    return GetDateRequest(period=Period.EXACT, exact_date=day.strftime("%m-%d-%Y"))
+
+
+def _parse_local_date_requests(query: str) -> Optional[GetDateRequests]:
+    """
+    Resolve the date range of common phrasings like 'last 10 years', 'between X and Y',
+    'as of X' and 'since X' locally.
+
+    Returns:
+        GetDateRequests, or None when the query needs the LLM
+    """
+    current = GetDateRequest(period=Period.CURRENT)
+    current_year = datetime.now().year
+    try:
+        if match := _LAST_PERIOD_PATTERN.search(query):
+            start = GetDateRequest(period=Period(match.group(2).lower()), duration=int(match.group(1)))
+            return GetDateRequests(start_date=start, end_date=current)
+        if match := _BETWEEN_PATTERN.search(query):
+            start_match, end_match = _match_date(match.group(1)), _match_date(match.group(2))
+            if start_match and end_match:
+                # 'between January and March 2023', a start without a year takes the end's year
+                end = _resolve_date(end_match, _date_year(end_match) or current_year, end_of_period=True)
+                start = _resolve_date(start_match, _date_year(start_match) or end.year)
+                # Inverted ranges, e.g. 'between December and January 2023', are left to the LLM
+                if start <= end:
+                    return GetDateRequests(start_date=_exact_date_request(start), end_date=_exact_date_request(end))
+        elif match := _AS_OF_PATTERN.search(query):
+            if exact_match := _match_date(match.group(1)):
+                exact = _exact_date_request(_resolve_date(exact_match, _date_year(exact_match) or current_year))
+                return GetDateRequests(start_date=exact, end_date=exact)
+        elif match := _SINCE_PATTERN.search(query):
+            if start_match := _match_date(match.group(1)):
+                start = _resolve_date(start_match, _date_year(start_match) or current_year)
+                return GetDateRequests(start_date=_exact_date_request(start), end_date=current)
+    except (ValueError, OverflowError):
+        # Unparseable dates (dateutil, datetime and pydantic errors are ValueErrors) are left to the LLM
+        return None
+    return None
+
 
 class QueryAnalyzer:
     """Analyzes and extracts structured information from user queries"""
 
-    def extract_metadata(self, query: str) -> QueryMetadata:
+    async def extract_metadata(self, query: str) -> QueryMetadata:
         """
         Extract structured metadata from a user query.
 
@@ -22,21 +224,20 @@ class QueryAnalyzer:
         Returns:
             QueryMetadata object containing structured query information
         """
-        start_date, end_date = self.extract_date_range(query)
-        instructions = (
-            f"Analyze this economic assets query: '{query}'\n"
-            f"Extract the region and main economic concept.\n Make sure to convert region to standard format/proper names. "
-            f"For example, 'US' should be converted to 'United States', 'Eurozone' to 'European Union', etc."
-            f"If region isn't specified, default to '{DEFAULT_REGION}'."
-        )
-
         try:
-            qm = make_instructor_call(instructions, "Extract query metadata", QueryMetadata)
-            qm.start_date = start_date
-            qm.end_date = end_date
-            return qm
+            # Dates are resolved on every call so relative ranges stay anchored to today
+            date_requests = _parse_local_date_requests(query)
+            if date_requests is None:
+                # Extract metadata and date range in a single call
+                qm = await self._extract_query_metadata(query, QueryMetadataWithDates)
+                return qm.to_query_metadata()
+
+            qm = await self._extract_query_metadata(query, QueryMetadata)
+            start_date, end_date = date_requests.extract_date_range()
+            # Copy so the cached instance is never mutated
+            return qm.model_copy(update={"start_date": start_date, "end_date": end_date})
         except Exception as e:
-            logger.error(f"Error extracting query metadata: {str(e)}")
+            logger.error("Error extracting query metadata: %s", e)
             # Return default metadata if extraction fails
             return QueryMetadata(
                 region=DEFAULT_REGION,
@@ -46,9 +247,28 @@ class QueryAnalyzer:
             )
 
     @staticmethod
-    def extract_date_range(query: str) -> tuple[str, str]:
+    async def _extract_query_metadata(query: str, response_model: Type[QueryMetadata]) -> QueryMetadata:
+        """
+        Extract region and economic concept from a query, memoized per normalized query.
+        Passing QueryMetadataWithDates also extracts the date range in the same call.
         """
-        Extracts start and end dates from a natural language query using Instructor.
+        # The query is sent as typed, casing helps the LLM tell e.g. 'US' from 'us'
+        cache_key = (_normalize_query(query), response_model)
+        if cache_key in _query_metadata_cache:
+            return _query_metadata_cache[cache_key]
+
+        template = _METADATA_WITH_DATES_TMPL if response_model is QueryMetadataWithDates else _METADATA_TMPL
+        instructions = template.substitute(query=query)
+
+        qm = await amake_instructor_call(instructions, "Extract query metadata", response_model)
+        _query_metadata_cache[cache_key] = qm
+        return qm
+
+    @staticmethod
+    async def extract_date_range(query: str) -> tuple[str, str]:
+        """
+        Extracts start and end dates from a natural language query, using Instructor
+        only when the phrasing isn't one of the common patterns resolved locally.
 
         Args:
             query (str): Natural language query about a time period
@@ -56,28 +276,26 @@ class QueryAnalyzer:
         Returns:
             GetDateRequests: Structured date range specification
         """
-        instructions = """
-        Extract start and end dates from the query. Follow these rules:
-
-        1. For relative periods (e.g., "last 10 years"):
-           - Start date: Use appropriate period (day/week/month/year) with duration
-           - End date: Use period="current"
-
-        2. For exact date ranges (e.g., "between Oct 12 2020 and Nov 19 2023"):
-           - Both dates: Use period="exact" with exact_date in MM-DD-YYYY format
-
-        3. For single point references (e.g., "as of January 2023"):
-           - Both dates: Use period="exact" with same exact_date
-
-        4. Always ensure dates are properly formatted (MM-DD-YYYY for exact dates)
-        """
+        date_requests = _parse_local_date_requests(query)
+        if date_requests is None:
+            date_requests = await QueryAnalyzer._extract_date_requests(query)
+        # Only the relative date specification is cached, dates are resolved against today on every call
+        return date_requests.extract_date_range()
 
-        date_requests = make_instructor_call(
-            instructions=instructions,
+    @staticmethod
+    async def _extract_date_requests(query: str) -> GetDateRequests:
+        """Extract the date range specification from a query, memoized per normalized query"""
+        cache_key = _normalize_query(query)
+        if cache_key in _date_requests_cache:
+            return _date_requests_cache[cache_key]
+
+        date_requests = await amake_instructor_call(
+            instructions=_DATE_RANGE_INSTRUCTIONS,
             user_prompt=query,
             response_model=GetDateRequests
         )
-        return date_requests.extract_date_range()
+        _date_requests_cache[cache_key] = date_requests
+        return date_requests
 
 
 class SeriesAnalyzer:
@@ -86,61 +304,119 @@ class SeriesAnalyzer:
     def __init__(self, fred_client: Fred, vector_db: VectorDBManager):
         self.fred = fred_client
         self.vector_db = vector_db
+        # Keep references to fire-and-forget tasks so they are not garbage collected mid-flight
+        self._background_tasks: Set[asyncio.Task] = set()
 
     async def find_series(self, user_query:str, concept: str, region: str) -> SeriesSelection:
         """
         Find the most appropriate FRED series using vector search first,
         then falling back to traditional search if needed.
         """
-        logger.info(f"Searching for series matching concept: {concept}, region: {region}")
+        logger.info("Searching for series matching concept: %s, region: %s", concept, region)
 
         try:
             # First try vector search
-            search_query = f"user query: {user_query}, concept: {concept}, region: {region}"
-            similar_series = await self.vector_db.search_series(search_query)
+            vector_query = f"user query: {user_query}, concept: {concept}, region: {region}"
+            similar_series = await self.vector_db.search_series(vector_query)
 
             if similar_series:
                 selection = await self._analyze_series_mapping_results(user_query, concept, region, similar_series)
                 if selection.is_valid():
-                    logger.info(f"Found matching series via vector search: {selection.series_id}")
+                    logger.info("Found matching series via vector search: %s", selection.series_id)
                     return selection
 
-            # Use AI to search FRED if no mapping found
-            results = self.fred.search(f"{region}, {concept}", limit=500)
+            # Use AI to search FRED if no mapping found. The search only starts on a miss, as a worker
+            # thread can't be cancelled and a speculative search would cost FRED quota on every hit
+            results = await asyncio.to_thread(self._search_fred, f"{region}, {concept}")
             if results is None or results.empty:
                 # try expanded search
-                search_query = self._generate_search_query(user_query, concept, region)
-                results = self.fred.search(search_query, limit=500)
+                search_query = await self._generate_search_query(user_query, concept, region)
+                results = await asyncio.to_thread(self._search_fred, search_query)
                 if results is None or results.empty:
                     return self._create_no_match_selection(concept, region)
 
-            series_mappings = self._convert_fred_results_to_mappings(results)
+            # Narrow the candidates by embedding similarity before asking the LLM to pick one
+            candidates = self._convert_fred_results_to_mappings(results, top_k=FRED_SEARCH_LIMIT)
+            series_mappings = await self._rerank_candidates(vector_query, candidates)
             selection = await self._analyze_series_mapping_results(user_query, concept, region, series_mappings)
 
-            # If we found a new series, enhance and store it
+            # If we found a new series, enhance and store it along with the other shortlisted candidates
+            # in the background, so similar queries hit vector search without delaying this response
             if selection.is_valid():
-                await self._enhance_and_store_series(selection.series_id, concept)
-                logger.info(f"Stored new series in vector DB: {selection.series_id}")
+                task = asyncio.create_task(self._enhance_and_store_many(series_mappings, concept))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
 
             return selection
 
         except Exception as e:
-            logger.error(f"Error finding series: {str(e)}", exc_info=True)
+            logger.error("Error finding series: %s", e, exc_info=True)
             return self._create_no_match_selection(concept, region)
 
+    def _search_fred(self, search_query: str) -> Optional[pd.DataFrame]:
+        """Search FRED, returning None on failure so the caller falls through to the next search"""
+        try:
+            return self.fred.search(search_query, limit=FRED_SEARCH_LIMIT)
+        except Exception as e:
+            logger.error("Error searching FRED for '%s': %s", search_query, e)
+            return None
+
     @staticmethod
-    def _convert_fred_results_to_mappings(results: pd.DataFrame) -> List[SeriesMapping]:
+    async def _rerank_candidates(
+            query: str,
+            candidates: List[SeriesMapping],
+            top_k: int = FRED_RERANK_TOP_K
+    ) -> List[SeriesMapping]:
+        """
+        Rank candidate series by cosine similarity to the query and keep the best matches.
+
+        Args:
+            query: Text the candidates are compared against
+            candidates: Series mappings built from FRED search results
+            top_k: Number of candidates to keep
+
+        Returns:
+            The top_k candidates, most similar first
+        """
+        if len(candidates) <= top_k:
+            return candidates
+
+        try:
+            # Candidates and query share a single embeddings request
+            texts = [f"{m.title}. {m.description}" for m in candidates] + [query]
+            embeddings = np.asarray(await asyncio.to_thread(get_embeddings_batch, texts))
+        except Exception as e:
+            logger.error("Error re-ranking FRED candidates, keeping search order: %s", e)
+            return candidates[:top_k]
+
+        # OpenAI embeddings are unit length, so the dot product is the cosine similarity
+        scores = embeddings[:-1] @ embeddings[-1]
+        return [candidates[i] for i in np.argsort(-scores)[:top_k]]
+
+    @staticmethod
+    def _convert_fred_results_to_mappings(results: pd.DataFrame, top_k: int = FRED_SEARCH_TOP_K) -> List[SeriesMapping]:
         """
         Convert FRED search results DataFrame to list of SeriesMapping objects.
 
         Args:
             results: DataFrame from FRED search API
+            top_k: Number of leading results to convert
 
         Returns:
             List of SeriesMapping objects with basic information
         """
+        # Clean the columns once instead of per row, missing columns and NaNs fall back to defaults
+        records = (
+            results.iloc[:top_k]
+            .reindex(columns=_FRED_RESULT_COLUMNS)
+            .fillna(_FRED_RESULT_DEFAULTS)
+            .astype(object)
+            .where(lambda df: df.notna(), None)
+            .to_dict('records')
+        )
+
         mappings = []
-        for _, row in results.head().iterrows():
+        for row in records:
             try:
                 # Create a basic SeriesMapping with available information
                 mapping = SeriesMapping(
@@ -148,24 +424,25 @@ class SeriesAnalyzer:
                     title=row['title'],
                     keywords=[],  # Will be enhanced later if selected
                     region='',  # Default, will be enhanced later
-                    category=row.get('group_id', 'Unknown'),
-                    description=row.get('notes', ''),
-                    frequency=row.get('frequency', 'Unknown'),
-                    units=row.get('units', 'Unknown'),
-                    seasonal_adjustment=row.get('seasonal_adjustment'),
+                    category=row['group_id'],
+                    description=row['notes'],
+                    frequency=row['frequency'],
+                    units=row['units'],
+                    seasonal_adjustment=row['seasonal_adjustment'],
                     metadata={
                         'title': row['title'],
-                        'notes': row.get('notes', ''),
-                        'frequency': row.get('frequency', 'Unknown'),
-                        'units': row.get('units', 'Unknown'),
-                        'seasonal_adjustment': row.get('seasonal_adjustment'),
-                        'last_updated': row.get('last_updated', 'Unknown'),
+                        'notes': row['notes'],
+                        'frequency': row['frequency'],
+                        'units': row['units'],
+                        'seasonal_adjustment': row['seasonal_adjustment'],
+                        # fredapi parses last_updated from search results into a datetime
+                        'last_updated': str(row['last_updated']),
                     },
                     embedding_id=f"series_{row['id']}"
                 )
                 mappings.append(mapping)
             except Exception as e:
-                logger.error(f"Error converting series {row.get('id', 'unknown')}: {str(e)}")
+                logger.error("Error converting series %s: %s", row['id'] or 'unknown', e)
                 continue
 
         return mappings
@@ -178,77 +455,91 @@ class SeriesAnalyzer:
             similar_series: List[SeriesMapping]
     ) -> SeriesSelection:
         """Analyze vector search results using LLM"""
-        prompt = (
-            f"Analyze these FRED series for the concept '{concept}' in {region}:\n"
-            "\n".join(f"- {s.title} ({s.series_id}): \n {s.simplified_dict}"
-                      for s in similar_series)
+        # Candidates are part of the key so the vector and FRED fallback passes don't share a selection
+        cache_key = _cache_key(
+            user_query, concept, region, *(s.series_id for s in similar_series[:MAX_SELECTION_CANDIDATES])
         )
+        if cache_key in _series_selection_cache:
+            return _series_selection_cache[cache_key]
 
-        return make_instructor_call(
+        series_lines = [
+            f"- {s.title} ({s.series_id}): \n {s.simplified_dict}"
+            for s in similar_series[:MAX_SELECTION_CANDIDATES]
+        ]
+        prompt = _SERIES_SELECTION_TMPL.substitute(concept=concept, region=region, series="\n".join(series_lines))
+
+        selection = await amake_instructor_call(
             prompt,
             f"Select the best matching series for this user query: {user_query}",
             SeriesSelection
         )
+        _series_selection_cache[cache_key] = selection
+        return selection
 
-    async def _enhance_and_store_series(self, series_id: str, context_query: str):
-        """Enhance series metadata and store in vector DB"""
-        if await self.vector_db.series_exists(series_id):
-            return
-
-        series_info = self.fred.get_series_info(series_id)
-
-        enhancement_prompt = (
-            f"Analyze this FRED economic assets series and provide structured information:\n\n"
-            f"Title: {series_info['title']}\n"
-            f"Original Description: {series_info.get('notes', '')}\n"
-            f"Units: {series_info.get('units', '')}\n"
-            f"Frequency: {series_info.get('frequency', '')}\n"
-            f"Context Query: {context_query}\n\n"
-            "Provide a comprehensive analysis including:\n"
-            "1. A clear description of what this series measures\n"
-            "2. Common use cases in economic analysis\n"
-            "3. Related economic concepts\n"
-            "4. Relevant search keywords\n"
-            "5. The primary economic category"
+    async def _enhance_and_store_many(self, candidates: List[SeriesMapping], context_query: str):
+        """Enhance metadata of several candidate series concurrently and store them in vector DB in one upsert"""
+        try:
+            existing = await self.vector_db.existing_series_ids([c.series_id for c in candidates])
+            series_ids = [c.series_id for c in candidates if c.series_id not in existing]
+            if not series_ids:
+                return
+
+            results = await asyncio.gather(
+                *(self._enhance_series(series_id, context_query) for series_id in series_ids),
+                return_exceptions=True
+            )
+            mappings = []
+            for series_id, result in zip(series_ids, results):
+                if isinstance(result, Exception):
+                    logger.error("Error enhancing series %s: %s", series_id, result)
+                    continue
+                mappings.append(result)
+
+            if mappings:
+                await self.vector_db.store_series_batch(mappings)
+                logger.info("Stored new series in vector DB: %s", [m.series_id for m in mappings])
+        except Exception as e:
+            logger.error("Error storing candidate series: %s", e, exc_info=True)
+
+    async def _enhance_series(self, series_id: str, context_query: str) -> SeriesMapping:
+        """Build a SeriesMapping with LLM-enhanced metadata for a FRED series"""
+        series_info = await asyncio.to_thread(self.fred.get_series_info, series_id)
+
+        enhancement_prompt = _ENHANCEMENT_TMPL.substitute(
+            title=series_info['title'],
+            notes=series_info.get('notes', ''),
+            units=series_info.get('units', ''),
+            frequency=series_info.get('frequency', ''),
+            context_query=context_query
         )
 
-        enhanced_info: SeriesEnhancement = make_instructor_call(
+        enhanced_info: SeriesEnhancement = await amake_instructor_call(
             enhancement_prompt,
             "Analyze the FRED series",
             SeriesEnhancement
         )
 
-        mapping = SeriesMapping.from_fred_series(
+        return SeriesMapping.from_fred_series(
             series_id=series_id,
             series_info=series_info,
             enhanced_info=enhanced_info,
         )
 
-        await self.vector_db.store_series(mapping)
-
 
     @staticmethod
-    def _generate_search_query(user_query:str, concept: str, region: str) -> str:
+    async def _generate_search_query(user_query:str, concept: str, region: str) -> str:
         """Generate optimized FRED search query"""
-        prompt = f"""Given:
-        Original Query: {user_query}
-        Economic Concept: {concept}
-        Region: {region}
-
-        Create a search query optimized for the FRED database.
-        Consider:
-        1. Technical economic terms
-        2. Unpack Standard abbreviations (e.g., 'CPI' to 'Consumer Price Index')
-        3. Regional identifiers. Use standard names (e.g., 'United States' instead of 'US', "European Union" instead of "Eurozone")
-        4. Category terms
-        5. Combine alternate phrasings, for example, 'unemployment rate / jobless rate' or "Inflation (CPI)"
-        6. Combine various regional identifiers (e.g., 'US / United States /USA' or 'Eurozone / European Union / Europe')
+        cache_key = _cache_key(user_query, concept, region)
+        if cache_key in _search_query_cache:
+            return _search_query_cache[cache_key]
 
-        Return only the optimized search terms, no explanation."""
-        return call_llm(prompt).strip()
+        prompt = _SEARCH_QUERY_TMPL.substitute(user_query=user_query, concept=concept, region=region)
+        search_query = (await acall_llm(prompt)).strip()
+        _search_query_cache[cache_key] = search_query
+        return search_query
 
     @staticmethod
-    def _analyze_search_results(
+    async def _analyze_search_results(
             results: pd.DataFrame,
             concept: str,
             region: str
@@ -261,7 +552,7 @@ class SeriesAnalyzer:
             f"From these options:\n"
             f"{results[['id', 'title', 'notes']].head().to_string()}"
         )
-        return make_instructor_call(prompt, "Select the best FRED series", SeriesSelection)
+        return await amake_instructor_call(prompt, "Select the best FRED series", SeriesSelection)
 
     @staticmethod
     def _create_no_match_selection(concept: str, region: str) -> SeriesSelection:
@@ -278,11 +569,11 @@ class DataAnalyzer:
     """Analyzes economic assets and generates insights"""
 
     @staticmethod
-    def analyze_series(
+    async def analyze_series(
             user_query: str,
             data: pd.Series,
             latest_value: str,
-            series_info: dict,
+            series_info: SeriesInfoLite,
             region: str
     ) -> EconomicAnalysis:
         """
@@ -299,20 +590,15 @@ class DataAnalyzer:
             EconomicAnalysis containing structured insights
         """
         try:
-            instructions = (
-                f"Create a natural response for:\n"
-                f"Query: {user_query}\n"
-                f"Region: {region}:\n"
-                f"Series: {series_info['title']}\n"
-                f"Latest Value: {latest_value}\n"
-                f"Time Range: {data.index[0]} to {data.index[-1]}\n"
-                f"Provide structured analysis including latest value, "
-                f"Focus on answering the query directly with relevant context."
-                f"trend, and key observations."
+            instructions = DataAnalyzer._analysis_instructions(user_query, data, latest_value, series_info, region)
+            return await amake_instructor_call(
+                instructions,
+                "Analyze the economic assets",
+                EconomicAnalysis,
+                model=ANALYSIS_LLM_MODEL
             )
-            return make_instructor_call(instructions, "Analyze the economic assets", EconomicAnalysis)
         except Exception as e:
-            logger.error(f"Error analyzing assets: {str(e)}")
+            logger.error("Error analyzing assets: %s", e)
             # Return basic analysis if AI analysis fails
             return EconomicAnalysis(
                 latest_value=latest_value,
@@ -320,3 +606,49 @@ class DataAnalyzer:
                 key_observations=["Data available but analysis failed"],
                 confidence_score=0.0
             )
+
+    @staticmethod
+    def stream_analysis(
+            user_query: str,
+            data: pd.Series,
+            latest_value: str,
+            series_info: SeriesInfoLite,
+            region: str
+    ) -> AsyncGenerator[EconomicAnalysis, None]:
+        """
+        Stream the analysis of economic time series assets as it is generated.
+
+        Args:
+            user_query: Original user query
+            data: Time series assets
+            latest_value: Latest assets value formatted with units
+            series_info: Series metadata
+            region: Geographic region
+
+        Returns:
+            Async generator of partially filled EconomicAnalysis objects, fields fill in generation order
+        """
+        instructions = DataAnalyzer._analysis_instructions(user_query, data, latest_value, series_info, region)
+        return astream_instructor_call(
+            instructions,
+            "Analyze the economic assets",
+            EconomicAnalysis,
+            model=ANALYSIS_LLM_MODEL
+        )
+
+    @staticmethod
+    def _analysis_instructions(
+            user_query: str,
+            data: pd.Series,
+            latest_value: str,
+            series_info: SeriesInfoLite,
+            region: str
+    ) -> str:
+        return _ANALYSIS_TMPL.substitute(
+            user_query=user_query,
+            region=region,
+            title=series_info.title,
+            latest_value=latest_value,
+            start=data.index[0],
+            end=data.index[-1]
+        )
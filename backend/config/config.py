@@ -1,41 +1,141 @@
+import atexit
+import hashlib
 import logging
+import logging.handlers
+import queue
+import threading
 from pathlib import Path
-from typing import List
+from typing import AsyncGenerator, List
 
+import httpx
 import instructor
+import numpy as np
+from cachetools import LRUCache, TTLCache, cachedmethod
 from fredapi import Fred
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
 
-from backend.config.env import FRED_API_KEY, OPENAI_API_KEY, EMBED_MODEL
+from backend.config.env import FRED_API_KEY, OPENAI_API_KEY, EMBED_MODEL, EMBED_DIMENSION, LOG_LEVEL
+
+# Records are formatted by the QueueHandler and written by a background listener thread,
+# so stream writes never block the event loop
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=LOG_LEVEL,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 # Constants
 OBSERVATION_START_DATE = "2024-01-01"
 DEFAULT_REGION = "United States"
+DEFAULT_LLM_MODEL = "gpt-4o-mini"  # extraction and selection tasks
+ANALYSIS_LLM_MODEL = "gpt-4o"  # user facing analysis, where answer quality matters most
+FRED_SEARCH_LIMIT = 20  # candidates fetched per FRED search, only the top few are ever used
+FRED_SEARCH_TOP_K = 5  # candidates passed on to series selection
+FRED_RERANK_TOP_K = 3  # candidates kept after embedding re-ranking of a full search page
+PLOT_DPI = 150  # plots are displayed in the web UI, 300 dpi doubled encode time for no visible gain
+PLOT_POOL_SIZE = 4  # pre-built figures, bounds how many plots render concurrently
+ALLOWED_ORIGINS = ["http://localhost:5173"]  # frontend dev server
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 PLOTS_DIR = BASE_DIR / "output" / "plots"
 PLOTS_DIR.mkdir(parents=True, exist_ok=True)
 
+
+class CachedFred(Fred):
+    """
+    Fred client that memoizes series metadata for a day and observations for an hour.
+    FRED metadata changes monthly at most and observations at most daily.
+    Cached objects are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._series_info_cache: TTLCache = TTLCache(maxsize=1024, ttl=86400)
+        self._series_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+        self._cache_lock = threading.Lock()  # FRED calls are made from worker threads
+
+    @cachedmethod(lambda self: self._series_info_cache, lock=lambda self: self._cache_lock)
+    def get_series_info(self, series_id):
+        return super().get_series_info(series_id)
+
+    @cachedmethod(lambda self: self._series_cache, lock=lambda self: self._cache_lock)
+    def get_series(self, series_id, observation_start=None, observation_end=None, **kwargs):
+        return super().get_series(series_id, observation_start=observation_start, observation_end=observation_end, **kwargs)
+
+
 # Initialize global clients
-fred = Fred(api_key=FRED_API_KEY)
+fred = CachedFred(api_key=FRED_API_KEY)
 client = OpenAI(api_key=OPENAI_API_KEY)
 iclient = instructor.from_openai(client)
+# Pooled keep-alive connections let concurrent requests share TLS sessions instead of reconnecting
+aclient = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(max_connections=64, max_keepalive_connections=32))
+)
+aiclient = instructor.from_openai(aclient)
 
 def call_llm(content: str, temperature: float = 0.0) -> str:
-    return client.chat.completions.create(model="gpt-4o-mini", temperature=temperature, messages=[{"role": "user", "content": content}]).choices[0].message.content or ""
+    return client.chat.completions.create(model=DEFAULT_LLM_MODEL, temperature=temperature, messages=[{"role": "user", "content": content}]).choices[0].message.content or ""
+
+async def acall_llm(content: str, temperature: float = 0.0) -> str:
+    response = await aclient.chat.completions.create(model=DEFAULT_LLM_MODEL, temperature=temperature, messages=[{"role": "user", "content": content}])
+    return response.choices[0].message.content or ""
+
+# Embeddings are deterministic per model and text, repeated searches are served from memory.
+# Entries are float32 arrays, about 2 KB each at 512 dimensions against 16 KB as a list of floats
+_embedding_cache: LRUCache = LRUCache(maxsize=10_000)
+_embedding_cache_lock = threading.Lock()  # embeddings are requested from worker threads
+
+def _embedding_cache_key(text: str) -> str:
+    return hashlib.sha256(f"{EMBED_MODEL}:{EMBED_DIMENSION}:{text}".encode()).hexdigest()
 
 def get_embedding(query: str) -> List[float]:
     text = query.replace("\n", " ")
-    return client.embeddings.create(input=[text], model=EMBED_MODEL).data[0].embedding
+    key = _embedding_cache_key(text)
+    with _embedding_cache_lock:
+        embedding = _embedding_cache.get(key)
+    if embedding is None:
+        response = client.embeddings.create(input=[text], model=EMBED_MODEL, dimensions=EMBED_DIMENSION)
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        with _embedding_cache_lock:
+            _embedding_cache[key] = embedding
+    return embedding.tolist()
+
+def get_embeddings_batch(texts: List[str]) -> List[List[float]]:
+    inputs = [text.replace("\n", " ") for text in texts]
+    keys = [_embedding_cache_key(text) for text in inputs]
+    with _embedding_cache_lock:
+        embeddings = [_embedding_cache.get(key) for key in keys]
+
+    # Only texts that missed the cache are sent, in a single request
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        response = client.embeddings.create(
+            input=[inputs[i] for i in missing], model=EMBED_MODEL, dimensions=EMBED_DIMENSION
+        )
+        with _embedding_cache_lock:
+            for item in response.data:
+                i = missing[item.index]
+                embeddings[i] = _embedding_cache[keys[i]] = np.asarray(item.embedding, dtype=np.float32)
+    return [embedding.tolist() for embedding in embeddings]
+
+def make_instructor_call(instructions, user_prompt, response_model, model: str = DEFAULT_LLM_MODEL):
+    return iclient.messages.create(model=model, messages=[{"role": "system", "content": instructions}, {"role": "user", "content": user_prompt}
+    ], response_model=response_model)
+
+async def amake_instructor_call(instructions, user_prompt, response_model, model: str = DEFAULT_LLM_MODEL):
+    return await aiclient.messages.create(model=model, messages=[{"role": "system", "content": instructions}, {"role": "user", "content": user_prompt}
+    ], response_model=response_model)
 
-def make_instructor_call(instructions, user_prompt, response_model):
-    return iclient.messages.create(model="gpt-4o", messages=[{"role": "system", "content": instructions}, {"role": "user", "content": user_prompt}
+def astream_instructor_call(instructions, user_prompt, response_model, model: str = DEFAULT_LLM_MODEL) -> AsyncGenerator:
+    """Yield partially filled response_model instances while the completion is generated"""
+    return aiclient.create_partial(model=model, messages=[{"role": "system", "content": instructions}, {"role": "user", "content": user_prompt}
     ], response_model=response_model)
 
 class FREDError(Exception):
@@ -9,9 +9,11 @@ PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY")
 PINECONE_INDEX_NAME = os.environ.get('PINECONE_INDEX_NAME', 'fred-search')
 PINECONE_CLOUD_PROVIDER = os.environ.get('PINECONE_CLOUD', 'aws')
 PINECONE_CLOUD_REGION = os.environ.get('PINECONE_REGION', 'us-east-1')
-PINECONE_DIMENSION = int(os.environ.get('PINECONE_DIMENSION', 1536)) # dimensionality of text-embedding-ada-002
-PINECONE_METRIC = os.environ.get('PINECONE_METRIC', 'cosine')
 EMBED_MODEL = os.environ.get('EMBED_MODEL', "text-embedding-3-small")
+EMBED_DIMENSION = int(os.environ.get('EMBED_DIMENSION', 512)) # text-embedding-3 models support truncated dimensions
+PINECONE_DIMENSION = int(os.environ.get('PINECONE_DIMENSION', EMBED_DIMENSION)) # must match EMBED_DIMENSION
+PINECONE_METRIC = os.environ.get('PINECONE_METRIC', 'cosine')
 FRED_API_KEY = os.environ.get("FRED_API_KEY")
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'WARNING').upper() # INFO shows per-query progress
 
 DATA_FOLDER = Path(__file__).parent.parent.parent / "assets"
\ No newline at end of file
@@ -1,11 +1,10 @@
-import asyncio
-import json
 import logging
 from pathlib import Path
-from typing import AsyncGenerator, Dict, Any, List
+from typing import AsyncGenerator, AsyncIterator, Dict, Any, List
 
 from backend.macro_specialist import MacroSpecialist
 from backend.config.config import fred
+from backend.schemas import StreamEvent, TextEvent
 from backend.vector_db import get_vector_db
 
 
@@ -24,11 +23,11 @@ def ensure_output_dir(base_path: str) -> Path:
         output_dir.mkdir(parents=True, exist_ok=True)
         return output_dir
     except Exception as e:
-        logging.error(f"Failed to create output directory {output_dir}: {str(e)}")
+        logging.error("Failed to create output directory %s: %s", output_dir, e)
         # Fall back to current directory if we can't create the specified path
         fallback_dir = Path.cwd() / "output"
         fallback_dir.mkdir(exist_ok=True)
-        logging.warning(f"Using fallback directory: {fallback_dir}")
+        logging.warning("Using fallback directory: %s", fallback_dir)
         return fallback_dir
 
 
@@ -40,9 +39,9 @@ def save_plot(base64_data: str, filename: str, output_dir: Path) -> None:
         plot_path = output_dir / filename
         with open(plot_path, "wb") as f:
             f.write(base64.b64decode(base64_data))
-        logging.info(f"Plot saved: {plot_path}")
+        logging.info("Plot saved: %s", plot_path)
     except Exception as e:
-        logging.error(f"Error saving plot: {str(e)}")
+        logging.error("Error saving plot: %s", e)
 
 
 def create_text_from_metadata(metadata: Dict[str, Any]) -> List[str]:
@@ -76,14 +75,79 @@ def create_text_from_analysis(analysis: Dict[str, Any]) -> List[str]:
     return lines
 
 
-async def stream_text(lines: List[str]) -> AsyncGenerator[str, None]:
-    """Stream text line by line"""
+def _completed_analysis_lines(partial: Any, final: bool) -> List[str]:
+    """
+    Format the fields of a partial analysis that are done being generated.
+    A field is done once the LLM has moved on to the next one, or when the stream has ended.
+    """
+    lines = ["Analysis Results:"]
+    if partial.latest_value is None or (not final and partial.trend_description is None):
+        return lines
+    lines += [f"Latest Value: {partial.latest_value}", ""]
+
+    if partial.trend_description is None or (not final and partial.key_observations is None):
+        return lines
+    lines += [f"Trend: {partial.trend_description}", "", "Key Observations:"]
+
+    observations = partial.key_observations or []
+    if not final and partial.confidence_score is None:
+        # The last observation may still be growing
+        observations = observations[:-1]
+    lines += [f"• {obs}" for obs in observations]
+    return lines
+
+
+async def create_text_from_analysis_stream(partials: AsyncIterator[Any]) -> AsyncGenerator[List[str], None]:
+    """
+    Convert a stream of partial analyses into formatted lines, yielding new lines as soon as they are complete.
+    Produces the same lines as create_text_from_analysis.
+    """
+    emitted = 0
+    latest = None
+    try:
+        async for partial in partials:
+            latest = partial
+            lines = _completed_analysis_lines(partial, final=False)
+            if len(lines) > emitted:
+                yield lines[emitted:]
+                emitted = len(lines)
+    except Exception as e:
+        logging.error("Error streaming analysis: %s", e)
+        yield ["Analysis unavailable"]
+        return
+
+    if latest is None:
+        yield ["Analysis unavailable"]
+        return
+
+    lines = _completed_analysis_lines(latest, final=True)
+    if len(lines) > emitted:
+        yield lines[emitted:]
+
+
+def dump_line(event: StreamEvent) -> bytes:
+    """Serialize a stream event as one NDJSON line, encoded straight to UTF-8 bytes by pydantic-core"""
+    return event.__pydantic_serializer__.to_json(event) + b"\n"
+
+
+# Spacer lines repeat in every response, encode the event once
+_BLANK_LINE = dump_line(TextEvent(content=""))
+
+
+async def stream_text(lines: List[str], chunk_size: int = 8192) -> AsyncGenerator[bytes, None]:
+    """
+    Stream text lines as NDJSON events, batched into chunks of up to chunk_size bytes.
+    Whatever is buffered is flushed when the lines run out, so each call is sent as soon as it is ready.
+    """
+    buffer = bytearray()
     for line in lines:
-        yield json.dumps({
-            "type": "text",
-            "content": line
-        }) + "\n"
-        await asyncio.sleep(0.05)  # Small delay between lines
+        # Lines are built by the text helpers above, no need to validate them again
+        buffer += dump_line(TextEvent.model_construct(content=line)) if line else _BLANK_LINE
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
 
 
 async def initialize_chatbot() -> MacroSpecialist:
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any
 
 from fredapi import Fred
@@ -20,20 +21,21 @@ class MacroSpecialist:
         self.plot_manager = PlotManager()
         self.formatter = DataFormatter()
 
-    async def process_query(self, user_query: str) -> ChatbotResponse:
+    async def process_query(self, user_query: str, stream_analysis: bool = False) -> ChatbotResponse:
         """
         Process an economic assets query and return structured response.
 
         Args:
             user_query: Natural language query about economic assets
+            stream_analysis: Return the analysis as a stream of partial results instead of awaiting it
 
         Returns:
             ChatbotResponse containing structured analysis and visualization
         """
-        logger.info(f"Processing query: {user_query}")
+        logger.info("Processing query: %s", user_query)
 
         try:
-            query_metadata = self.query_analyzer.extract_metadata(user_query)
+            query_metadata = await self.query_analyzer.extract_metadata(user_query)
             series_selection = await self.series_analyzer.find_series(
                 user_query,
                 query_metadata.economic_concept,
@@ -43,11 +45,11 @@ class MacroSpecialist:
             if not series_selection.series_id:
                 return ChatbotResponse.create_error(
                     "No matching assets series found",
-                    f"{series_selection.reasoning}_{query_metadata.model_dump()}"
+                    f"{series_selection.reasoning}_{query_metadata.model_dump_json()}"
                 )
 
             try:
-                data, series_info = self.fred_service.get_series_data(
+                data, series_info = await self.fred_service.get_series_data(
                     series_selection.series_id,
                     query_metadata.start_date,
                     query_metadata.end_date
@@ -55,66 +57,89 @@ class MacroSpecialist:
             except Exception as e:
                 return ChatbotResponse.create_error(
                     "Error fetching assets",
-                    f"{str(e)}_{query_metadata.model_dump()}"
+                    f"{str(e)}_{query_metadata.model_dump_json()}"
                 )
 
             latest_value = self.formatter.format_value(
                 data.iloc[-1],
-                series_info['units']
-            )
-            analysis = self.data_analyzer.analyze_series(
-                user_query,
-                data,
-                latest_value,
-                series_info,
-                query_metadata.region
+                series_info.units
             )
+            if stream_analysis:
+                # The analysis stream is lazy, its LLM request starts once the response streams. The plot renders
+                # in the background meanwhile and is awaited just before its URL is sent
+                analysis = visualization = None
+                analysis_stream = self.data_analyzer.stream_analysis(
+                    user_query,
+                    data,
+                    latest_value,
+                    series_info,
+                    query_metadata.region
+                )
+                visualization_task = asyncio.create_task(asyncio.to_thread(
+                    self.plot_manager.create_visualization,
+                    data,
+                    series_info.title,
+                    series_info.units
+                ))
+            else:
+                analysis_stream = visualization_task = None
+                # The LLM analysis and the CPU-bound plot rendering are independent, run them together
+                analysis, visualization = await asyncio.gather(
+                    self.data_analyzer.analyze_series(
+                        user_query,
+                        data,
+                        latest_value,
+                        series_info,
+                        query_metadata.region
+                    ),
+                    asyncio.to_thread(
+                        self.plot_manager.create_visualization,
+                        data,
+                        series_info.title,
+                        series_info.units
+                    )
+                )
 
             source_info = SourceInfo(
                 series_id=series_selection.series_id,
-                title=series_info['title'],
+                title=series_info.title,
                 observation_start=query_metadata.start_date or data.index[0].strftime('%Y-%m-%d'),
                 observation_end=query_metadata.end_date or data.index[-1].strftime('%Y-%m-%d'),
-                frequency=series_info['frequency'],
-                seasonal_adjustment=series_info.get('seasonal_adjustment'),
-                units=series_info['units'],
-                notes=series_info.get('notes'),
-                last_updated=series_info['last_updated']
-            )
-
-            visualization = self.plot_manager.create_visualization(
-                data,
-                series_info['title'],
-                series_info['units']
+                frequency=series_info.frequency,
+                seasonal_adjustment=series_info.seasonal_adjustment,
+                units=series_info.units,
+                notes=series_info.notes,
+                last_updated=series_info.last_updated
             )
 
-            return ChatbotResponse(
-                status="success",
-                query_info=QueryInfo(
+            return ChatbotResponse.create_success(
+                query_info=QueryInfo.model_construct(
                     original_query=user_query,
                     metadata=query_metadata.model_dump(),
                     confidence=series_selection.confidence
                 ),
-                series_info=SeriesInfo(
+                series_info=SeriesInfo.model_construct(
                     id=series_selection.series_id,
-                    title=series_info['title'],
-                    units=series_info['units'],
-                    frequency=series_info['frequency'],
-                    last_updated=series_info['last_updated'],
+                    title=series_info.title,
+                    units=series_info.units,
+                    frequency=series_info.frequency,
+                    last_updated=series_info.last_updated,
                     region_match=series_selection.region_match,
                     selection_reasoning=series_selection.reasoning
                 ),
-                analysis=AnalysisResult(
+                analysis=AnalysisResult.model_construct(
                     latest_value=analysis.latest_value,
                     trend=analysis.trend_description,
                     key_observations=analysis.key_observations,
                     confidence_score=analysis.confidence_score
-                ),
+                ) if analysis else None,
                 visualization=visualization,
-                source_info=source_info
+                source_info=source_info,
+                analysis_stream=analysis_stream,
+                visualization_task=visualization_task
             )
         except Exception as e:
-            logger.error(f"Error processing query: {str(e)}", exc_info=True)
+            logger.error("Error processing query: %s", e, exc_info=True)
             return ChatbotResponse.create_error(
                 "An unexpected error occurred",
                 str(e)
@@ -1,16 +1,29 @@
+import asyncio
 import base64
-import uuid
+import hashlib
+import os
+import queue
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
 from typing import Optional, Tuple, Dict
 
+import matplotlib
+matplotlib.use('Agg')  # headless rendering, plots are only ever written to PNG
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from fredapi import Fred
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 
-from backend.config.config import DataError, FREDError, OBSERVATION_START_DATE, PLOTS_DIR
+from backend.config.config import DataError, FREDError, OBSERVATION_START_DATE, PLOTS_DIR, PLOT_DPI, \
+    PLOT_POOL_SIZE
 from backend.config.config import logger
-from backend.schemas import Visualization, PlotData
+from backend.schemas import Visualization, PlotData, SeriesInfoLite
+
+plt.style.use('fivethirtyeight')  # applied once, figures pick the style up when they are created
 
 
 class FredManager:
@@ -19,12 +32,12 @@ class FredManager:
     def __init__(self, fred_client: Fred):
         self.client = fred_client
 
-    def get_series_data(
+    async def get_series_data(
             self,
             series_id: str,
             start_date: Optional[str] = None,
             end_date: Optional[str] = None
-    ) -> Tuple[pd.Series, dict]:
+    ) -> Tuple[pd.Series, SeriesInfoLite]:
         """
         Retrieve time series assets and metadata from FRED.
 
@@ -37,26 +50,47 @@ class FredManager:
             Tuple of (time series assets, series metadata)
         """
         try:
-            series_info = self.client.get_series_info(series_id)
-            data = self.client.get_series(
-                series_id,
-                observation_start=start_date,
-                observation_end=end_date
+            # Metadata and observations are independent requests, fetch them concurrently
+            series_info, data = await asyncio.gather(
+                asyncio.to_thread(self.client.get_series_info, series_id),
+                asyncio.to_thread(
+                    self.client.get_series,
+                    series_id,
+                    observation_start=start_date,
+                    observation_end=end_date
+                )
             )
 
             if data.empty:
                 raise DataError(f"No assets available for series {series_id}")
 
-            return data, series_info.to_dict()
+            return data, SeriesInfoLite.from_fred(series_info)
 
         except Exception as e:
-            logger.error(f"Error fetching FRED assets: {str(e)}")
+            logger.error("Error fetching FRED assets: %s", e)
             raise FREDError(f"Failed to retrieve assets for series {series_id}: {str(e)}")
 
 
 class PlotManager:
     def __init__(self):
         self.output_dir = PLOTS_DIR
+        # Figures are built once and checked out per render, so concurrent plots never share one
+        self._figures: queue.Queue = queue.Queue(maxsize=PLOT_POOL_SIZE)
+        for _ in range(PLOT_POOL_SIZE):
+            self._figures.put(self._new_figure())
+        self._file_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plot-writer")
+
+    @staticmethod
+    def _new_figure() -> Tuple[Figure, Axes]:
+        """Build a figure with its axes and the static source attribution"""
+        fig = Figure(figsize=(12, 7))
+        ax = fig.add_subplot()
+        fig.text(
+            0.99, 0.01,
+            'Source: Federal Reserve Economic Data (FRED)',
+            ha='right', va='bottom', fontsize=8, style='italic'
+        )
+        return fig, ax
 
     def create_visualization(self, data, title: str, units: str) -> Visualization:
         """Create plot and return Visualization object"""
@@ -67,53 +101,32 @@ class PlotManager:
                 format="png"
             )
         except Exception as e:
-            logger.error(f"Error creating visualization: {str(e)}")
+            logger.error("Error creating visualization: %s", e)
             return Visualization(plot=None, format="png")
 
     def create_and_encode_plot(self, data, title: str, units: str) -> Dict:
         """Create plot and return plot assets dictionary"""
         try:
-            # Set up the plot
-            plt.style.use('fivethirtyeight')
-            fig, ax = plt.subplots(figsize=(12, 7))
-
-            # Plot assets
-            ax.plot(data.index, data.values, linewidth=2)
-
-            # Set labels and title
-            ax.set_title(title, pad=20)
-            ax.set_xlabel('Date', labelpad=10)
-            ax.set_ylabel(units, labelpad=10)
-
-            # Add grid and source attribution
-            ax.grid(True, alpha=0.3)
-            plt.figtext(
-                0.99, 0.01,
-                'Source: Federal Reserve Economic Data (FRED)',
-                ha='right', va='bottom', fontsize=8, style='italic'
-            )
-
-            # Generate unique filename
-            plot_filename = f"plot_{uuid.uuid4()}.png"
+            fig, ax = self._figures.get()
+            try:
+                png_bytes = self._render_png(fig, ax, data, title, units)
+            finally:
+                self._figures.put((fig, ax))
+            encoded_plot = base64.b64encode(png_bytes).decode()
+
+            # Name the file after its content, identical plots map to the same cacheable file
+            plot_filename = f"plot_{hashlib.sha1(png_bytes).hexdigest()[:16]}.png"
             plot_path = self.output_dir / plot_filename
 
-            # Save to file
-            logger.info(f"Saving plot to: {plot_path}")
-            plt.savefig(plot_path, bbox_inches='tight', dpi=300)
-
-            # Save to BytesIO for base64 encoding
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', dpi=300)
-            buffer.seek(0)
-            encoded_plot = base64.b64encode(buffer.getvalue()).decode()
-
-            plt.close()
-
-            # Verify file was created
-            if not plot_path.exists():
-                raise FileNotFoundError(f"Failed to save plot to {plot_path}")
+            if plot_path.exists():
+                logger.info("Plot already saved at: %s", plot_path)
+            else:
+                # Write the already rendered bytes to disk in the background
+                logger.info("Saving plot to: %s", plot_path)
+                write = self._file_writer.submit(self._write_atomic, plot_path, png_bytes)
+                write.add_done_callback(lambda f: self._log_write_error(f, plot_path))
 
-            logger.info(f"Successfully created plot: {plot_filename}")
+            logger.info("Successfully created plot: %s", plot_filename)
             return {
                 "base64": encoded_plot,
                 "filename": plot_filename,
@@ -121,10 +134,53 @@ class PlotManager:
             }
 
         except Exception as e:
-            logger.error(f"Error creating plot: {str(e)}")
+            logger.error("Error creating plot: %s", e)
+            raise
+
+    @staticmethod
+    def _render_png(fig: Figure, ax: Axes, data, title: str, units: str) -> bytes:
+        """Redraw the series on a pooled figure and render it to PNG once"""
+        ax.clear()
+
+        # Plot assets
+        ax.plot(data.index, data.values, linewidth=2)
+
+        # Set labels and title
+        ax.set_title(title, pad=20)
+        ax.set_xlabel('Date', labelpad=10)
+        ax.set_ylabel(units, labelpad=10)
+
+        # Add grid
+        ax.grid(True, alpha=0.3)
+
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight', dpi=PLOT_DPI)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _log_write_error(write: Future, plot_path) -> None:
+        if write.exception() is not None:
+            logger.error("Failed to save plot to %s: %s", plot_path, write.exception())
+
+    @staticmethod
+    def _write_atomic(path, data: bytes) -> None:
+        """Write to a temporary file next to path and rename it into place, so a plot is never seen half-written"""
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
             raise
 
 
+# Magnitude buckets used when formatting dollar values
+_DOLLAR_THRESHOLDS = np.array([1e6, 1e9, 1e12])
+_DOLLAR_SCALES = np.array([1.0, 1e6, 1e9, 1e12])
+_DOLLAR_SUFFIXES = np.array(['', 'M', 'B', 'T'])
+
+
 class DataFormatter:
     """Handles formatting of economic assets values"""
 
@@ -141,9 +197,10 @@ class DataFormatter:
             Formatted string representation
         """
         try:
-            if 'percent' in units.lower():
+            units = units.lower()
+            if 'percent' in units:
                 return f"{value:.1f}%"
-            elif 'dollar' in units.lower():
+            elif 'dollar' in units:
                 if abs(value) >= 1e12:
                     return f"${value/1e12:.1f}T"
                 elif abs(value) >= 1e9:
@@ -152,15 +209,49 @@ class DataFormatter:
                     return f"${value/1e6:.1f}M"
                 else:
                     return f"${value:,.2f}"
-            elif 'index' in units.lower():
+            elif 'index' in units:
                 return f"{value:.1f}"
             else:
                 return f"{value:,.2f}"
 
         except Exception as e:
-            logger.error(f"Error formatting value: {str(e)}")
+            logger.error("Error formatting value: %s", e)
             return str(value)
 
+    @staticmethod
+    def format_values(values: pd.Series, units: str) -> pd.Series:
+        """
+        Format a whole series of numeric values, vectorized equivalent of format_value.
+
+        Args:
+            values: Numeric values to format
+            units: Unit type (e.g., 'Percent', 'Dollars', 'Index')
+
+        Returns:
+            Series of formatted strings with the same index
+        """
+        units = units.lower()
+        array = values.to_numpy(dtype=float)
+
+        # np.char.mod returns a float array for empty input, so its result is cast to str
+        if 'percent' in units:
+            formatted = np.char.add(np.char.mod('%.1f', array).astype(str), '%').astype(object)
+        elif 'dollar' in units:
+            # Bucket 0 keeps full precision, buckets 1-3 are scaled to M/B/T
+            bucket = np.digitize(np.abs(array), _DOLLAR_THRESHOLDS)
+            bucket[np.isnan(array)] = 0
+            scaled = np.char.mod('%.1f', array / _DOLLAR_SCALES[bucket]).astype(str)
+            formatted = np.char.add(np.char.add('$', scaled), _DOLLAR_SUFFIXES[bucket]).astype(object)
+            plain = bucket == 0
+            formatted[plain] = [f"${value:,.2f}" for value in array[plain]]
+        elif 'index' in units:
+            formatted = np.char.mod('%.1f', array).astype(str).astype(object)
+        else:
+            # numpy has no thousands separator, fall back to str.format
+            formatted = np.array([f"{value:,.2f}" for value in array], dtype=object)
+
+        return pd.Series(formatted, index=values.index)
+
     @staticmethod
     def format_date_range(
             start_date: Optional[str],
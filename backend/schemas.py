@@ -1,12 +1,16 @@
-from datetime import datetime, timedelta
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import List, Any, Dict
+from functools import cached_property, lru_cache
+from typing import List, Any, AsyncIterator, Dict, Literal, Union
 from typing import Optional
 
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 from instructor import OpenAISchema
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+from typing_extensions import TypedDict
 from pydantic import Field
 
 from backend.config.config import DEFAULT_REGION, OBSERVATION_START_DATE
@@ -92,6 +96,16 @@ class SeriesEnhancement(OpenAISchema):
         description="Geographic region this series pertains to. If you can not tell, default to 'United States'",
     )
 
+class FredMeta(TypedDict, total=False):
+    """FRED metadata kept alongside a SeriesMapping"""
+    title: str
+    units: str
+    frequency: str
+    seasonal_adjustment: Optional[str]
+    notes: Optional[str]
+    last_updated: str
+
+
 class SeriesMapping(BaseModel):
     """
     Maps economic concepts to FRED series with metadata.
@@ -107,7 +121,7 @@ class SeriesMapping(BaseModel):
     seasonal_adjustment: Optional[str] = None
     common_uses: List[str] = Field(default_factory=list, description="AI-generated common use cases")
     related_concepts: List[str] = Field(default_factory=list, description="AI-generated related economic concepts")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional FRED metadata")
+    metadata: FredMeta = Field(default_factory=dict, description="Additional FRED metadata")
     embedding_id: str = Field("", description="Unique identifier for vector storage")
 
     @classmethod
@@ -140,10 +154,8 @@ class SeriesMapping(BaseModel):
             'last_updated': series_info.get('last_updated', ''),
         }
 
-        # Combine provided keywords with AI-generated ones
-        combined_keywords = list(set(
-            (keywords or []) + enhanced_info.keywords
-        ))
+        # Combine provided keywords with AI-generated ones, deduplicated in a stable order
+        combined_keywords = list(dict.fromkeys([*(keywords or ()), *enhanced_info.keywords]))
 
         return cls(
             series_id=series_id,
@@ -179,6 +191,7 @@ class SeriesMapping(BaseModel):
         Convert to a Pinecone-compatible dictionary with flattened metadata.
         Pinecone metadata must be primitive types or lists of strings.
         """
+        md = self.metadata
         return {
             "series_id": self.series_id,
             "title": self.title,
@@ -192,17 +205,18 @@ class SeriesMapping(BaseModel):
             "common_uses": self.common_uses,
             "related_concepts": self.related_concepts,
             # Flatten metadata fields we want to preserve
-            "metadata_title": self.metadata.get("title", ""),
-            "metadata_units": self.metadata.get("units", ""),
-            "metadata_frequency": self.metadata.get("frequency", ""),
-            "metadata_notes": self.metadata.get("notes", ""),
-            "metadata_last_updated": self.metadata.get("last_updated", ""),
+            "metadata_title": md.get("title", ""),
+            "metadata_units": md.get("units", ""),
+            "metadata_frequency": md.get("frequency", ""),
+            "metadata_notes": md.get("notes", ""),
+            "metadata_last_updated": md.get("last_updated", ""),
         }
 
     @classmethod
     def from_pinecone_dict(cls, data: Dict[str, Any]) -> "SeriesMapping":
         """
         Create a SeriesMapping instance from Pinecone metadata.
+        The payload was written by to_pinecone_dict, so it is trusted and skips validation.
         """
         # Reconstruct metadata dictionary
         metadata = {
@@ -213,7 +227,7 @@ class SeriesMapping(BaseModel):
             "last_updated": data.get("metadata_last_updated", ""),
         }
 
-        return cls(
+        return cls.model_construct(
             series_id=data["series_id"],
             title=data["title"],
             keywords=data["keywords"],
@@ -237,6 +251,18 @@ class SeriesMapping(BaseModel):
         )
 
     def to_embedding_text(self) -> str:
+        # Only the fields that describe the series, ids and raw FRED metadata add tokens but no meaning
+        return (
+            f"{self.title}\n"
+            f"{self.description}\n"
+            f"category: {self.category}\n"
+            f"region: {self.region}\n"
+            f"keywords: {', '.join(self.keywords)}\n"
+            f"uses: {', '.join(self.common_uses)}\n"
+            f"related: {', '.join(self.related_concepts)}"
+        )
+
+    def to_full_json(self) -> str:
         return self.model_dump_json()
 
 
@@ -264,6 +290,29 @@ class EconomicAnalysis(OpenAISchema):
     )
 
 
+@dataclass(slots=True)
+class SeriesInfoLite:
+    """FRED series metadata needed to build a response, read once from fredapi's info Series"""
+    title: str
+    units: str
+    frequency: str
+    last_updated: str
+    seasonal_adjustment: Optional[str] = None
+    notes: Optional[str] = None
+
+    @classmethod
+    def from_fred(cls, info: pd.Series) -> "SeriesInfoLite":
+        """Pick the known fields out of Fred.get_series_info() without materializing a dict"""
+        return cls(
+            title=info['title'],
+            units=info['units'],
+            frequency=info['frequency'],
+            last_updated=info['last_updated'],
+            seasonal_adjustment=info.get('seasonal_adjustment'),
+            notes=info.get('notes')
+        )
+
+
 class QueryInfo(BaseModel):
     """Structure for query metadata"""
     original_query: str
@@ -283,6 +332,9 @@ class SeriesInfo(BaseModel):
 
 class SourceInfo(BaseModel):
     """Information about the assets source"""
+    # Frozen so instances are hashable and citations can be memoized
+    model_config = ConfigDict(frozen=True)
+
     series_id: str
     title: str
     observation_start: Optional[str]
@@ -297,22 +349,29 @@ class SourceInfo(BaseModel):
 
     def format_citation(self) -> str:
         """Format source information as a citation string"""
-        date_range = f" ({self.observation_start} to {self.observation_end})" if self.observation_start and self.observation_end else ""
+        return _format_citation(self)
 
-        citation = (
-            f"Source: {self.source_name}\n"
-            f"Series: {self.title} ({self.series_id}){date_range}\n"
-            f"Units: {self.units}"
-        )
 
-        if self.seasonal_adjustment:
-            citation += f"\nSeasonal Adjustment: {self.seasonal_adjustment}"
+@lru_cache(maxsize=256)
+def _format_citation(source_info: SourceInfo) -> str:
+    # Sessions keep citing the same series, so identical sources reuse the formatted string
+    date_range = f" ({source_info.observation_start} to {source_info.observation_end})" if source_info.observation_start and source_info.observation_end else ""
+
+    citation = (
+        f"Source: {source_info.source_name}\n"
+        f"Series: {source_info.title} ({source_info.series_id}){date_range}\n"
+        f"Units: {source_info.units}"
+    )
 
-        citation += f"\nFrequency: {self.frequency}"
-        citation += f"\nLast Updated: {self.last_updated}"
-        citation += f"\nRetrieved from: {self.source_url}/series/{self.series_id}"
+    if source_info.seasonal_adjustment:
+        citation += f"\nSeasonal Adjustment: {source_info.seasonal_adjustment}"
+
+    citation += f"\nFrequency: {source_info.frequency}"
+    citation += f"\nLast Updated: {source_info.last_updated}"
+    citation += f"\nRetrieved from: {source_info.source_url}/series/{source_info.series_id}"
+
+    return citation
 
-        return citation
 
 class AnalysisResult(BaseModel):
     """Structure for analysis results"""
@@ -342,6 +401,31 @@ class ChatbotResponse(BaseModel):
     analysis: Optional[AnalysisResult] = Field(None, description="Analysis results")
     visualization: Optional[Visualization] = Field(None, description="Visualization assets")
     source_info: Optional[SourceInfo] = Field(None, description="Source information")
+    # Partial analyses still being generated when the analysis is streamed instead of awaited
+    _analysis_stream: Optional[AsyncIterator[Any]] = PrivateAttr(default=None)
+    # Plot still being rendered while the analysis streams
+    _visualization_task: Optional["asyncio.Task[Visualization]"] = PrivateAttr(default=None)
+
+    @cached_property
+    def serialized_sections(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Plain dict form of each section, dumped once per response and reused by the stream"""
+        return {
+            "query_info": self.query_info.model_dump() if self.query_info else None,
+            "series_info": self.series_info.model_dump() if self.series_info else None,
+            "analysis": self.analysis.model_dump() if self.analysis else None,
+        }
+
+    @property
+    def analysis_stream(self) -> Optional[AsyncIterator[Any]]:
+        """Stream of partial EconomicAnalysis objects, set when analysis is generated lazily"""
+        return self._analysis_stream
+
+    async def resolve_visualization(self) -> Optional[Visualization]:
+        """The visualization, waiting for the plot to finish rendering when it was started in the background"""
+        if self._visualization_task is not None:
+            self.visualization = await self._visualization_task
+            self._visualization_task = None
+        return self.visualization
 
     @classmethod
     def create_error(cls, message: str, details: str) -> "ChatbotResponse":
@@ -357,22 +441,64 @@ class ChatbotResponse(BaseModel):
         cls,
         query_info: QueryInfo,
         series_info: SeriesInfo,
-        analysis: AnalysisResult,
-        visualization: Optional[Visualization] = None
+        analysis: Optional[AnalysisResult],
+        visualization: Optional[Visualization] = None,
+        source_info: Optional[SourceInfo] = None,
+        analysis_stream: Optional[AsyncIterator[Any]] = None,
+        visualization_task: Optional["asyncio.Task[Visualization]"] = None
     ) -> "ChatbotResponse":
         """Create a success response"""
-        return cls(
+        # Trust boundary: every part is built by MacroSpecialist from validated models, so skip re-validation
+        response = cls.model_construct(
             status="success",
             query_info=query_info,
             series_info=series_info,
             analysis=analysis,
-            visualization=visualization
+            visualization=visualization,
+            source_info=source_info
         )
+        response._analysis_stream = analysis_stream
+        response._visualization_task = visualization_task
+        return response
 
 class QueryRequest(BaseModel):
     query: str
 
 
+# Events streamed by /api/chat/stream, mirroring ChatMessage in frontend/src/types.ts
+class TextEvent(BaseModel):
+    type: Literal["text"] = "text"
+    content: str
+
+
+class ErrorContent(BaseModel):
+    message: Optional[str] = None
+    details: Optional[str] = None
+
+
+class ErrorEvent(BaseModel):
+    type: Literal["error"] = "error"
+    content: ErrorContent
+
+
+class VisualizationContent(BaseModel):
+    plot_url: str
+    format: str
+
+
+class VisualizationEvent(BaseModel):
+    type: Literal["visualization"] = "visualization"
+    content: VisualizationContent
+
+
+class SourceEvent(BaseModel):
+    type: Literal["source"] = "source"
+    content: str
+
+
+StreamEvent = Union[TextEvent, ErrorEvent, VisualizationEvent, SourceEvent]
+
+
 class Period(str, Enum):
     DAY = "day"
     WEEK = "week"
@@ -382,7 +508,16 @@ class Period(str, Enum):
     EXACT = "exact"
 
 
-class GetDateRequest(OpenAISchema):
+# Offset to subtract from the current date for each relative period
+_OFFSET = {
+    Period.DAY: lambda n: timedelta(days=n),
+    Period.WEEK: lambda n: timedelta(weeks=n),
+    Period.MONTH: lambda n: relativedelta(months=n),
+    Period.YEAR: lambda n: relativedelta(years=n),
+}
+
+
+class GetDateRequest(BaseModel):
     """
     Represents a single date request, either for start or end date.
     Used to convert natural language date references into structured format.
@@ -433,7 +568,12 @@ class GetDateRequests(OpenAISchema):
     )
 
     @staticmethod
-    def _get_date(period: Period, duration: Optional[int] = None, exact_date: Optional[str] = None) -> str:
+    def _get_date(
+            period: Period,
+            duration: Optional[int] = None,
+            exact_date: Optional[str] = None,
+            now: Optional[datetime] = None
+    ) -> str:
         """
         Returns an ISO formatted date string based on the period and duration from current date.
 
@@ -441,48 +581,79 @@ class GetDateRequests(OpenAISchema):
             period (Period): The time period unit (day, week, month, year, current, exact)
             duration (int): Number of periods to go back in time, >= 1
             exact_date (str, optional): Exact date in MM-DD-YYYY format
+            now (datetime, optional): Current date to resolve against, defaults to datetime.now()
 
         Returns:
             str: ISO formatted date string (YYYY-MM-DD)
         """
-        current_date = datetime.now()
+        current_date = now or datetime.now()
 
         if period == Period.CURRENT:
             return current_date.date().isoformat()
 
         if period == Period.EXACT and exact_date:
-            # convert exact date in MM-DD-YYYY format to datetime object
-            result_date = datetime.strptime(exact_date, "%m-%d-%Y")
-            return result_date.date().isoformat()
+            # exact_date is validated as MM-DD-YYYY, slice it instead of parsing with strptime
+            return date(int(exact_date[6:]), int(exact_date[:2]), int(exact_date[3:5])).isoformat()
 
         if not duration or duration < 0:
             raise ValueError("Duration must be non-negative if period is not 'current' or 'exact'")
 
-        if period == Period.DAY:
-            result_date = current_date - timedelta(days=duration)
-        elif period == Period.WEEK:
-            result_date = current_date - timedelta(weeks=duration)
-        elif period == Period.MONTH:
-            result_date = current_date - relativedelta(months=duration)
-        elif period == Period.YEAR:
-            result_date = current_date - relativedelta(years=duration)
-        else:
+        offset = _OFFSET.get(period)
+        if offset is None:
             raise ValueError(f"Invalid period: {period}")
 
-        return result_date.date().isoformat()
+        return (current_date - offset(duration)).date().isoformat()
 
     def extract_date_range(self) -> tuple[str, str]:
         """
         Extracts start and end dates from a natural language query using Instructor.
         """
+        # Resolve both ends against the same instant so they cannot straddle midnight
+        now = datetime.now()
         start_date = None if self.start_date.period == Period.CURRENT else self._get_date(
             period=self.start_date.period,
             duration=self.start_date.duration,
-            exact_date=self.start_date.exact_date
+            exact_date=self.start_date.exact_date,
+            now=now
         )
         end_date = self._get_date(
             period=self.end_date.period,
             duration=self.end_date.duration,
-            exact_date=self.end_date.exact_date
+            exact_date=self.end_date.exact_date,
+            now=now
+        )
+        return start_date, end_date
+
+
+class QueryMetadataWithDates(QueryMetadata):
+    """
+    Query metadata together with its date range specification, extracted in a single LLM call.
+    """
+    start_date_request: GetDateRequest = Field(
+        ...,
+        description=(
+            "Start date specification. For relative queries like 'last X years', "
+            "this should use appropriate period and duration. For exact dates, "
+            "use period='exact' with exact_date"
+        )
+    )
+    end_date_request: GetDateRequest = Field(
+        ...,
+        description=(
+            "End date specification. For relative queries, this typically uses "
+            "period='current'. For exact date ranges, use period='exact' with exact_date"
+        )
+    )
+
+    def to_query_metadata(self) -> QueryMetadata:
+        """Resolve the date requests and return plain query metadata"""
+        start_date, end_date = GetDateRequests(
+            start_date=self.start_date_request,
+            end_date=self.end_date_request
+        ).extract_date_range()
+        return QueryMetadata(
+            region=self.region,
+            economic_concept=self.economic_concept,
+            start_date=start_date,
+            end_date=end_date
         )
-        return start_date, end_date
\ No newline at end of file
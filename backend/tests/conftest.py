@@ -0,0 +1,5 @@
+import os
+
+# The config module builds the API clients at import time, the tests never reach the network
+for key in ("FRED_API_KEY", "OPENAI_API_KEY", "PINECONE_API_KEY"):
+    os.environ.setdefault(key, "test")
@@ -0,0 +1,79 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+from fredapi import Fred
+
+from backend.analysis import SeriesAnalyzer, _parse_local_date_requests
+from backend.schemas import Period
+
+
+@pytest.mark.parametrize("query, start, end", [
+    ("gdp between Oct 12 2020 and Nov 19 2023", "10-12-2020", "11-19-2023"),
+    ("unemployment between 2019 and 2021 in the US", "01-01-2019", "12-31-2021"),
+    ("gdp between January and March 2023", "01-01-2023", "03-31-2023"),
+    ("cpi between Feb 2024 and Feb 2024", "02-01-2024", "02-29-2024"),
+    ("rates between 03/15/2022 and 2023", "03-15-2022", "12-31-2023"),
+    ("inflation as of January 2023?", "01-01-2023", "01-01-2023"),
+    ("cpi as of 03/15/2022", "03-15-2022", "03-15-2022"),
+])
+def test_exact_date_phrasings_resolve_locally(query, start, end):
+    date_requests = _parse_local_date_requests(query)
+    assert date_requests is not None
+    assert date_requests.start_date.period == Period.EXACT
+    assert date_requests.start_date.exact_date == start
+    assert date_requests.end_date.exact_date == end
+
+
+def test_since_date_resolves_locally():
+    date_requests = _parse_local_date_requests("mortgage rates since March 2020")
+    assert date_requests.start_date.exact_date == "03-01-2020"
+    assert date_requests.end_date.period == Period.CURRENT
+
+
+def test_last_period_resolves_locally():
+    date_requests = _parse_local_date_requests("unemployment over the last 10 years")
+    assert date_requests.start_date.period == Period.YEAR
+    assert date_requests.start_date.duration == 10
+    assert date_requests.end_date.period == Period.CURRENT
+
+
+@pytest.mark.parametrize("query", [
+    "when was unemployment between 3 and 4 percent",
+    "mortgage rates since 2 years ago",
+    "gdp as of q3 2023",
+    "inflation since the 1990s",
+    "gdp between December and January 2023",
+    "gdp between 2023 and 2019",
+    "show me us inflation",
+])
+def test_ambiguous_phrasings_are_left_to_the_llm(query):
+    assert _parse_local_date_requests(query) is None
+
+
+_SEARCH_RESPONSE = """<?xml version="1.0" encoding="utf-8" ?>
+<seriess realtime_start="2024-10-10" realtime_end="2024-10-10" order_by="search_rank" sort_order="desc"
+         count="2" offset="0" limit="2">
+  <series id="UNRATE" realtime_start="2024-10-10" realtime_end="2024-10-10" title="Unemployment Rate"
+          observation_start="1948-01-01" observation_end="2024-09-01" frequency="Monthly" frequency_short="M"
+          units="Percent" units_short="%" seasonal_adjustment="Seasonally Adjusted"
+          seasonal_adjustment_short="SA" last_updated="2024-10-04 07:44:02-05" popularity="94"
+          group_popularity="94" notes="The unemployment rate represents the number of unemployed as a percentage of the labor force."/>
+  <series id="UNRATENSA" realtime_start="2024-10-10" realtime_end="2024-10-10" title="Unemployment Rate"
+          observation_start="1948-01-01" observation_end="2024-09-01" frequency="Monthly" frequency_short="M"
+          units="Percent" units_short="%" seasonal_adjustment="Not Seasonally Adjusted"
+          seasonal_adjustment_short="NSA" last_updated="2024-10-04 07:44:05-05" popularity="58"
+          group_popularity="94"/>
+</seriess>"""
+
+
+def test_fred_search_results_convert_to_mappings(monkeypatch):
+    # Run the response through fredapi's own search parsing, so the frame has its real column types
+    fred = Fred(api_key="test")
+    monkeypatch.setattr(fred, "_Fred__fetch_data", lambda url: ET.fromstring(_SEARCH_RESPONSE.encode()))
+    results = fred.search("unemployment", limit=2)
+
+    mappings = SeriesAnalyzer._convert_fred_results_to_mappings(results)
+
+    assert [m.series_id for m in mappings] == ["UNRATE", "UNRATENSA"]
+    assert mappings[0].metadata["last_updated"].startswith("2024-10-04 07:44:02")
+    assert mappings[1].description == ""
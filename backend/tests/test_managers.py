@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.managers import DataFormatter
+
+_VALUES = [0.0, -0.04, 3.14159, 999_999.99, 1_250_000.0, -2.5e9, 7.8e12, np.nan, np.inf, -np.inf]
+
+
+@pytest.mark.parametrize("units", ["Percent", "Billions of Dollars", "Index 2017=100", "Thousands of Persons"])
+@pytest.mark.parametrize("values", [_VALUES, []], ids=["mixed", "empty"])
+def test_format_values_matches_format_value(units, values):
+    series = pd.Series(values, index=pd.date_range("2020-01-01", periods=len(values), freq="MS"), dtype=float)
+
+    formatted = DataFormatter.format_values(series, units)
+
+    assert formatted.index.equals(series.index)
+    assert formatted.tolist() == [DataFormatter.format_value(value, units) for value in series]
@@ -0,0 +1,46 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+from backend.web import CachedStaticFiles, PreflightMiddleware
+
+_ORIGIN = "http://localhost:5173"
+_CORS_OPTIONS = dict(allow_origins=[_ORIGIN], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+
+
+def _client(*middleware) -> TestClient:
+    app = Starlette(routes=[Route("/", lambda request: PlainTextResponse("ok"), methods=["POST"])])
+    for cls in middleware:
+        app.add_middleware(cls, **_CORS_OPTIONS)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("headers", [
+    {"origin": _ORIGIN, "access-control-request-method": "POST"},
+    {"origin": _ORIGIN, "access-control-request-method": "POST", "access-control-request-headers": "content-type"},
+    {"origin": _ORIGIN, "access-control-request-method": "POST", "access-control-request-private-network": "true"},
+    {"origin": "http://example.com", "access-control-request-method": "POST"},
+])
+def test_preflight_matches_cors_middleware(headers):
+    expected = _client(CORSMiddleware).options("/", headers=headers)
+    response = _client(CORSMiddleware, PreflightMiddleware).options("/", headers=headers)
+
+    assert response.status_code == expected.status_code
+    assert response.text == expected.text
+    assert list(response.headers.items()) == list(expected.headers.items())
+
+
+def test_cached_static_file_removed_after_caching_is_not_found(tmp_path):
+    plot = tmp_path / "plot.png"
+    plot.write_bytes(b"png")
+    client = TestClient(Starlette(routes=[Mount("/plots", CachedStaticFiles(directory=str(tmp_path)))]))
+    assert client.get("/plots/plot.png").content == b"png"
+
+    plot.unlink()
+    assert client.get("/plots/plot.png").status_code == 404
+
+    plot.write_bytes(b"new png")
+    assert client.get("/plots/plot.png").content == b"new png"
@@ -1,17 +1,68 @@
 import asyncio
-from typing import List
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Set, Tuple
 
 from fredapi import Fred
 from pinecone import Pinecone, ServerlessSpec
 
-from backend.config.config import logger, fred, get_embedding
-from backend.config.config import make_instructor_call
+from backend.config.config import logger, fred, get_embedding, get_embeddings_batch
+from backend.config.config import amake_instructor_call
 from backend.config.env import PINECONE_API_KEY, PINECONE_INDEX_NAME, PINECONE_DIMENSION, PINECONE_METRIC, \
     PINECONE_CLOUD_PROVIDER, PINECONE_CLOUD_REGION
 from backend.schemas import SeriesEnhancement
 from backend.schemas import SeriesMapping
 
 
+@dataclass(slots=True, frozen=True)
+class SeedEntry:
+    """A core economic series the vector database is seeded with"""
+    series_id: str
+    context: str
+    keywords: Tuple[str, ...]
+    region: str
+    category: str
+
+
+_INITIAL_MAPPINGS: Tuple[SeedEntry, ...] = (
+    SeedEntry(
+        series_id='GDP',
+        context='Gross Domestic Product, which measures total economic output',
+        keywords=('gdp', 'economic growth', 'output'),
+        region='United States',
+        category='GDP'
+    ),
+    SeedEntry(
+        series_id='CPIAUCSL',
+        context='Consumer Price Index, which measures inflation and price changes',
+        keywords=('inflation', 'prices', 'cpi', "consumer price index"),
+        region='United States',
+        category='Inflation'
+    ),
+    SeedEntry(
+        series_id="FPCPITOTLZGEUU",
+        context='Consumer Price Index, which measures inflation and price changes',
+        keywords=('inflation', 'prices', 'cpi', 'eurozone', "european union", "eu", "europe", "euro", "consumer price index"),
+        region='European Union',
+        category='Inflation'
+    ),
+    SeedEntry(
+        series_id='UNRATE',
+        context='Unemployment Rate, measuring joblessness in the labor force',
+        keywords=('unemployment', 'jobless', 'jobs'),
+        region='United States',
+        category='Unemployment'
+    ),
+    SeedEntry(
+        series_id='DFF',
+        context='Federal Funds Rate, the key interest rate set by the Federal Reserve',
+        keywords=('interest', 'rate', 'federal funds rate', 'monetary policy'),
+        region='United States',
+        category='Interest Rates'
+    ),
+)
+
+
 class VectorDBConfig:
     def __init__(self, fred_client: Fred):
         self.fred = fred_client
@@ -25,7 +76,7 @@ class VectorDBConfig:
     async def initialize_index(self):
         try:
             if self.index_name not in self.existing_indexes:
-                logger.info(f"Creating new index: {self.index_name}")
+                logger.info("Creating new index: %s", self.index_name)
                 self._pinecone_client.create_index(
                     name=self.index_name,
                     dimension=self.dimension,
@@ -35,131 +86,119 @@ class VectorDBConfig:
                 await asyncio.sleep(1)
                 await self._seed_vector_db()
             else:
-                logger.info(f"Index {self.index_name} already exists, skipping creation")
+                logger.info("Index %s already exists, skipping creation", self.index_name)
+                index_dimension = self._pinecone_client.describe_index(self.index_name).dimension
+                if index_dimension != self.dimension:
+                    raise ValueError(
+                        f"Index {self.index_name} has dimension {index_dimension} but embeddings have "
+                        f"{self.dimension}, recreate the index or set PINECONE_INDEX_NAME to a new index"
+                    )
         except Exception as e:
             if "ALREADY_EXISTS" in str(e):
-                logger.info(f"Index {self.index_name} already exists, continuing...")
+                logger.info("Index %s already exists, continuing...", self.index_name)
             else:
-                logger.error(f"Error initializing index: {str(e)}")
+                logger.error("Error initializing index: %s", e)
                 raise
 
-    @property
+    @cached_property
     def index(self):
+        # Building the Index client resolves the index host, do it once per config
         return self._pinecone_client.Index(self.index_name)
 
-    async def series_exists(self, series_id: str) -> bool:
-        return bool(self.index.fetch([f"series_{series_id}"]).vectors)
-
-
-    async def store_series(self, mapping: SeriesMapping):
-        text = mapping.to_embedding_text()
-        embedding = get_embedding(text)
-        self.index.upsert(
-            vectors=[(
-                mapping.embedding_id,
-                embedding,
-                mapping.to_pinecone_dict()
-            )]
+    async def existing_series_ids(self, series_ids: List[str]) -> Set[str]:
+        """Return which of the given series are already stored, using a single fetch"""
+        if not series_ids:
+            return set()
+        fetched = await asyncio.to_thread(self.index.fetch, [f"series_{series_id}" for series_id in series_ids])
+        return {series_id for series_id in series_ids if f"series_{series_id}" in fetched.vectors}
+
+    async def store_series_batch(self, mappings: List[SeriesMapping]):
+        # One embeddings request and one upsert for the whole batch, both off the event loop
+        embeddings = await asyncio.to_thread(
+            get_embeddings_batch,
+            [mapping.to_embedding_text() for mapping in mappings]
+        )
+        await asyncio.to_thread(
+            self.index.upsert,
+            vectors=[
+                (mapping.embedding_id, embedding, mapping.to_pinecone_dict())
+                for mapping, embedding in zip(mappings, embeddings)
+            ]
         )
 
     async def _seed_vector_db(self) -> None:
         """
         Seed the vector database with enhanced versions of core economic series.
         """
-        initial_mappings = {
-            'US_GDP': {
-                'series_id': 'GDP',
-                'context': 'Gross Domestic Product, which measures total economic output',
-                'keywords': ['gdp', 'economic growth', 'output'],
-                'region': 'United States',
-                'category': 'GDP'
-            },
-            'US_INFLATION': {
-                'series_id': 'CPIAUCSL',
-                'context': 'Consumer Price Index, which measures inflation and price changes',
-                'keywords': ['inflation', 'prices', 'cpi', "consumer price index"],
-                'region': 'United States',
-                'category': 'Inflation'
-            },
-            'EU_INFLATION': {
-                'series_id': "FPCPITOTLZGEUU",
-                'context': 'Consumer Price Index, which measures inflation and price changes',
-                'keywords': ['inflation', 'prices', 'cpi', 'eurozone', "european union", "eu", "europe", "euro", "consumer price index"],
-                'region': 'European Union',
-                'category': 'Inflation'
-            },
-            'US_UNEMPLOYMENT': {
-                'series_id': 'UNRATE',
-                'context': 'Unemployment Rate, measuring joblessness in the labor force',
-                'keywords': ['unemployment', 'jobless', 'jobs'],
-                'region': 'United States',
-                'category': 'Unemployment'
-            },
-            'US_INTEREST_RATE': {
-                'series_id': 'DFF',
-                'context': 'Federal Funds Rate, the key interest rate set by the Federal Reserve',
-                'keywords': ['interest', 'rate', 'federal funds rate', 'monetary policy'],
-                'region': 'United States',
-                'category': 'Interest Rates'
-            }
-        }
-
         logger.info("Starting vector database seeding process...")
 
-        for key, mapping in initial_mappings.items():
-            series_id = mapping['series_id']
-
-            # Check if series already exists in vector DB
-            if await self.series_exists(series_id):
-                logger.info(f"Series {series_id} already exists in vector DB, skipping...")
-                continue
-
-            try:
-                # Get FRED series info
-                series_info = self.fred.get_series_info(series_id)
-
-                # Generate enhancement prompt
-                enhancement_prompt = (
-                    f"Analyze this core FRED economic data series and provide structured information:\n\n"
-                    f"Title: {series_info['title']}\n"
-                    f"Series ID: {series_id}\n"
-                    f"Original Description: {series_info.get('notes', '')}\n"
-                    f"Context: {mapping['context']}\n"
-                    f"Category: {mapping['category']}\n"
-                    f"Units: {series_info.get('units', '')}\n"
-                    f"Frequency: {series_info.get('frequency', '')}\n\n"
-                    "Provide a comprehensive analysis including:\n"
-                    "1. A clear description of what this series measures\n"
-                    "2. Common use cases in economic analysis\n"
-                    "3. Related economic concepts\n"
-                    "4. Relevant search keywords (include existing keywords)\n"
-                    "5. The primary economic category"
-                )
+        # Check all series against the vector DB in one round-trip
+        existing = await self.existing_series_ids([entry.series_id for entry in _INITIAL_MAPPINGS])
+        pending = []
+        for entry in _INITIAL_MAPPINGS:
+            if entry.series_id in existing:
+                logger.info("Series %s already exists in vector DB, skipping...", entry.series_id)
+            else:
+                pending.append(entry)
 
-                # Get enhanced information using LLM
-                enhanced_info: SeriesEnhancement = make_instructor_call(
-                    enhancement_prompt,
-                    "Analyze the FRED series",
-                    SeriesEnhancement
-                )
+        # Each series is dominated by network latency (FRED, OpenAI), so seed them concurrently
+        results = await asyncio.gather(
+            *(self._seed_one(entry) for entry in pending),
+            return_exceptions=True
+        )
+        enhanced_mappings = []
+        for entry, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error("Error processing series %s: %s", entry.series_id, result, exc_info=result)
+            else:
+                enhanced_mappings.append(result)
 
-                # Create enhanced mapping
-                enhanced_mapping = SeriesMapping.from_fred_series(
-                    series_id=series_id,
-                    series_info=series_info,
-                    enhanced_info=enhanced_info,
-                    keywords=mapping['keywords']
-                )
+        # Store every enhanced series with a single embeddings request and upsert
+        if enhanced_mappings:
+            await self.store_series_batch(enhanced_mappings)
+            logger.info("Successfully enhanced and stored %s in vector DB", [m.series_id for m in enhanced_mappings])
 
-                # Store in vector DB
-                await self.store_series(enhanced_mapping)
-                logger.info(f"Successfully enhanced and stored {series_id} in vector DB")
+        logger.info("Vector database seeding completed")
 
-            except Exception as e:
-                logger.error(f"Error processing series {series_id}: {str(e)}", exc_info=True)
-                continue
+    async def _seed_one(self, entry: SeedEntry) -> SeriesMapping:
+        """Enhance a single core series with LLM-generated metadata"""
+        series_id = entry.series_id
+
+        # Get FRED series info
+        series_info = await asyncio.to_thread(self.fred.get_series_info, series_id)
+
+        # Generate enhancement prompt
+        enhancement_prompt = (
+            f"Analyze this core FRED economic data series and provide structured information:\n\n"
+            f"Title: {series_info['title']}\n"
+            f"Series ID: {series_id}\n"
+            f"Original Description: {series_info.get('notes', '')}\n"
+            f"Context: {entry.context}\n"
+            f"Category: {entry.category}\n"
+            f"Units: {series_info.get('units', '')}\n"
+            f"Frequency: {series_info.get('frequency', '')}\n\n"
+            "Provide a comprehensive analysis including:\n"
+            "1. A clear description of what this series measures\n"
+            "2. Common use cases in economic analysis\n"
+            "3. Related economic concepts\n"
+            "4. Relevant search keywords (include existing keywords)\n"
+            "5. The primary economic category"
+        )
 
-        logger.info("Vector database seeding completed")
+        # Get enhanced information using LLM
+        enhanced_info: SeriesEnhancement = await amake_instructor_call(
+            enhancement_prompt,
+            "Analyze the FRED series",
+            SeriesEnhancement
+        )
+
+        # Create enhanced mapping
+        return SeriesMapping.from_fred_series(
+            series_id=series_id,
+            series_info=series_info,
+            enhanced_info=enhanced_info,
+            keywords=list(entry.keywords)
+        )
 
 
 class VectorDBManager:
@@ -170,21 +209,23 @@ class VectorDBManager:
         self.index = config.index
 
     async def search_series(self, query: str, top_k: int = 5) -> List[SeriesMapping]:
-        query_embedding = get_embedding(query)
-        results = self.index.query(
+        # Run the blocking OpenAI and Pinecone calls off the event loop so callers can overlap other work
+        query_embedding = await asyncio.to_thread(get_embedding, query)
+        results = await asyncio.to_thread(
+            self.index.query,
             vector=query_embedding,
             top_k=top_k,
             include_metadata=True
         )
         if not results or not results.matches:
-            return logger.info(f"No result. Description of index: {self.index.describe_index_stats()}")
+            return logger.info("No result. Description of index: %s", self.index.describe_index_stats())
         return [SeriesMapping.from_pinecone_dict(match.metadata) for match in results.matches]
 
-    async def store_series(self, mapping: SeriesMapping):
-        await self.config.store_series(mapping)
+    async def store_series_batch(self, mappings: List[SeriesMapping]):
+        await self.config.store_series_batch(mappings)
 
-    async def series_exists(self, series_id: str) -> bool:
-        return await self.config.series_exists(series_id)
+    async def existing_series_ids(self, series_ids: List[str]) -> Set[str]:
+        return await self.config.existing_series_ids(series_ids)
 
 
 
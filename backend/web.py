@@ -0,0 +1,106 @@
+import logging
+import os
+import stat
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+from starlette.middleware.cors import CORSMiddleware
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class PreflightMiddleware:
+    """
+    Answer CORS preflight requests from the allowed origins with prebuilt headers before the rest of the stack runs.
+    Takes the CORSMiddleware arguments and builds its headers from a CORSMiddleware, so the responses can't drift apart.
+    Preflights that CORSMiddleware would check further (requested headers outside allow_headers, private network
+    access, methods it doesn't allow) or origins not listed explicitly fall through to it unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, **cors_options: Any):
+        self.app = app
+        cors = CORSMiddleware(app, **cors_options)
+        self._allow_methods = {method.encode() for method in cors.allow_methods}
+        self._allow_all_headers = cors.allow_all_headers
+        # Same order as CORSMiddleware's PlainTextResponse, the origin is echoed after the shared headers
+        shared = [(name.lower().encode(), value.encode()) for name, value in cors.preflight_headers.items()]
+        self._headers: Dict[bytes, List[Tuple[bytes, bytes]]] = {
+            origin.encode(): shared + [(b"access-control-allow-origin", origin.encode())]
+            for origin in cors.allow_origins
+            if origin != "*"
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        private_network = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+            elif name == b"access-control-request-private-network":
+                private_network = True
+
+        headers = self._headers.get(origin)
+        if (
+                headers is None
+                or request_method not in self._allow_methods
+                or private_network
+                or (request_headers is not None and not self._allow_all_headers)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if request_headers is not None:
+            # allow_headers=["*"] echoes whatever the browser asked for
+            headers = headers + [(b"access-control-allow-headers", request_headers)]
+        headers = headers + [(b"content-length", b"2"), (b"content-type", b"text/plain; charset=utf-8")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"OK"})
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles for write-once directories, remembers where each found file resolved to so hits skip resolving it.
+    The file is still statted on every request: FileResponse sends its headers before opening the file, so a file
+    removed after it was cached must be caught here to answer 404. Misses are not cached so new files are picked up.
+    """
+
+    def __init__(self, *args, maxsize: int = 2048, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lookups: LRUCache = LRUCache(maxsize=maxsize)
+        # lookup_path runs in the threadpool
+        self._lookups_lock = threading.Lock()
+
+    def lookup_path(self, path: str) -> Tuple[str, Optional[os.stat_result]]:
+        with self._lookups_lock:
+            full_path = self._lookups.get(path)
+        if full_path is not None:
+            try:
+                return full_path, os.stat(full_path)
+            except FileNotFoundError:
+                # Removed since it was cached, resolve it again, which answers 404 if it is gone for good
+                with self._lookups_lock:
+                    self._lookups.pop(path, None)
+
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            with self._lookups_lock:
+                self._lookups[path] = full_path
+        return full_path, stat_result
+
+
+class PlotsAccessLogFilter(logging.Filter):
+    """Drop uvicorn access log records for /plots assets, which the UI fetches for every rendered answer"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn.access records are logged with (client_addr, method, path, http_version, status_code) args
+        args = record.args
+        return not (isinstance(args, tuple) and len(args) >= 3 and str(args[2]).startswith("/plots/"))
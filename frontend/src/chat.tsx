@@ -50,13 +50,17 @@ const EconomicChat: React.FC = () => {
 
             const reader = response.body!.getReader()
             const decoder = new TextDecoder()
+            let buffered = ''
 
             while (true) {
                 const { value, done } = await reader.read()
                 if (done) break
 
-                const chunk = decoder.decode(value)
-                const lines = chunk.split('\n').filter(line => line.trim())
+                // A read can hold several lines or end mid-line, keep the partial last line for the next read
+                buffered += decoder.decode(value, { stream: true })
+                const parts = buffered.split('\n')
+                buffered = parts.pop() ?? ''
+                const lines = parts.filter(line => line.trim())
 
                 for (const line of lines) {
                     const message = JSON.parse(line) as ChatMessage
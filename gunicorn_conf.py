@@ -0,0 +1,16 @@
+"""
+Production server settings, run from the root directory of the project with:
+
+    gunicorn main:app -c gunicorn_conf.py
+
+Each worker is a separate interpreter that runs the FastAPI lifespan and builds its own chatbot,
+so pydantic serialization and plot rendering spread across cores instead of sharing one GIL.
+"""
+import os
+
+bind = os.getenv("BIND", "localhost:8000")
+# uvicorn.workers is deprecated since uvicorn 0.30, the worker lives in the uvicorn-worker package
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+# No per-request access log line, errors are still logged. Pass --access-logfile - to turn it back on
+accesslog = None
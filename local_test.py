@@ -66,7 +66,7 @@ async def process_test_queries(
                     print(f"Details: {response.details}")
 
         except Exception as e:
-            logger.error(f"Error processing query: {str(e)}", exc_info=True)
+            logger.error("Error processing query: %s", e, exc_info=True)
             print(f"\nError processing query: {str(e)}")
 
 async def main() -> None:
@@ -74,7 +74,7 @@ async def main() -> None:
     try:
         chatbot = await initialize_chatbot()
     except Exception as e:
-        logger.error(f"Failed to initialize chatbot: {str(e)}")
+        logger.error("Failed to initialize chatbot: %s", e)
         return
 
     # Test queries
@@ -90,7 +90,7 @@ async def main() -> None:
     try:
         await process_test_queries(chatbot, test_queries)
     except Exception as e:
-        logger.error(f"Error during test execution: {str(e)}", exc_info=True)
+        logger.error("Error during test execution: %s", e, exc_info=True)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,25 +1,29 @@
 import asyncio
-import json
+import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Awaitable, Callable, Optional
 
 from fastapi import FastAPI
 from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
 
-from backend.config.config import PLOTS_DIR
-from backend.config.utils import stream_text, create_text_from_analysis, create_text_from_metadata, \
-    initialize_chatbot
+from backend.config.config import ALLOWED_ORIGINS, PLOTS_DIR, logger
+from backend.config.utils import dump_line, stream_text, create_text_from_analysis, \
+    create_text_from_analysis_stream, create_text_from_metadata, initialize_chatbot
 from backend.macro_specialist import MacroSpecialist
-from backend.schemas import ChatbotResponse, QueryRequest
+from backend.schemas import ChatbotResponse, QueryRequest, ErrorEvent, ErrorContent, VisualizationEvent, \
+    VisualizationContent, SourceEvent
+from backend.web import CachedStaticFiles, PlotsAccessLogFilter, PreflightMiddleware
 
 chatbot: Optional[MacroSpecialist] = None
+# Set once startup has built the chatbot, requests arriving before that wait on it
+chatbot_ready = asyncio.Event()
 
 async def startup_event() -> None:
     global chatbot
     chatbot = await initialize_chatbot()
+    chatbot_ready.set()
 
 
 async def shutdown_event() -> None:
@@ -39,35 +43,28 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
 
 app = FastAPI(lifespan=lifespan)
 
+# Access logging is off by default, when it is turned on keep plot fetches out of it
+logging.getLogger("uvicorn.access").addFilter(PlotsAccessLogFilter())
+
 # Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],
+cors_options = dict(
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
-# Mount static files directory with absolute path
-app.mount("/plots", StaticFiles(directory=str(PLOTS_DIR)), name="plots")
-
-# Add logging to track file operations
-@app.get("/plots/{filename}")
-async def get_plot(filename: str):
-    file_path = PLOTS_DIR / filename
-    print(f"Looking for plot at: {file_path}")  # Debug print
-    if not file_path.exists():
-        print(f"File not found: {file_path}")  # Debug print
-        raise HTTPException(status_code=404, detail=f"Plot not found: {filename}")
-    return FileResponse(file_path)
+app.add_middleware(CORSMiddleware, **cors_options)
+# Added last so it runs first, preflights are answered before reaching CORSMiddleware, with the same headers
+app.add_middleware(PreflightMiddleware, **cors_options)
+# Mount static files directory with absolute path, plots are write-once so resolved lookups are cached
+app.mount("/plots", CachedStaticFiles(directory=str(PLOTS_DIR), html=False, check_dir=False), name="plots")
 
 @app.post("/api/chat/stream")
 async def stream_chat(request: QueryRequest):
-    global chatbot
-    if chatbot is None:
-        chatbot = await initialize_chatbot()
+    await chatbot_ready.wait()
 
     try:
-        response = await chatbot.process_query(request.query)
+        response = await chatbot.process_query(request.query, stream_analysis=True)
         return StreamingResponse(
             stream_response(response),
             media_type="text/event-stream"
@@ -75,56 +72,74 @@ async def stream_chat(request: QueryRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def stream_response(response: ChatbotResponse) -> AsyncGenerator[str, None]:
+async def stream_response(response: ChatbotResponse) -> AsyncGenerator[bytes, None]:
     """Stream the ChatbotResponse with proper formatting"""
+    # A producer task encodes the sections into a bounded queue while the chunks already queued are sent
+    queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=32)
+    producer = asyncio.create_task(_produce_response(response, queue))
+    try:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+    finally:
+        # Stop the producer if the client disconnected mid-stream, a no-op once it has finished
+        producer.cancel()
+
+async def _produce_response(response: ChatbotResponse, queue: "asyncio.Queue[Optional[bytes]]") -> None:
+    """Put the encoded chunks of the response on the queue, followed by a None sentinel"""
+    try:
+        await _put_response_chunks(response, queue.put)
+    except Exception as e:
+        logger.error("Error streaming response: %s", e, exc_info=True)
+        await queue.put(dump_line(ErrorEvent.model_construct(
+            content=ErrorContent.model_construct(message="An unexpected error occurred", details=str(e))
+        )))
+    await queue.put(None)
+
+async def _put_response_chunks(response: ChatbotResponse, put: Callable[[bytes], Awaitable[None]]) -> None:
+    # Events wrap fields of the already validated response, so they are constructed without validation
     if response.status != "success":
-        yield json.dumps({
-            "type": "error",
-            "content": {
-                "message": response.message,
-                "details": response.details
-            }
-        }) + "\n"
+        await put(dump_line(ErrorEvent.model_construct(
+            content=ErrorContent.model_construct(message=response.message, details=response.details)
+        )))
         return
 
     # Stream metadata lines
-    metadata_lines = create_text_from_metadata({
-        "query_info": response.query_info.model_dump(),
-        "series_info": response.series_info.model_dump()
-    })
+    sections = response.serialized_sections
+    metadata_lines = create_text_from_metadata(sections)
 
     async for chunk in stream_text(metadata_lines):
-        yield chunk
-
-    await asyncio.sleep(0.2)
-
-    # Stream analysis lines
-    analysis_lines = create_text_from_analysis(response.analysis.model_dump())
-    async for chunk in stream_text(analysis_lines):
-        yield chunk
-
-    # If visualization exists, send the plot URL
-    if response.visualization and response.visualization.plot:
-        await asyncio.sleep(0.2)
-        yield json.dumps({
-            "type": "visualization",
-            "content": {
-                "plot_url": f"/plots/{response.visualization.plot.filename}",
-                "format": response.visualization.format
-            }
-        }) + "\n"
-
-    # Stream source information
+        await put(chunk)
+
+    # Stream analysis lines, as they are generated when the analysis is streamed
+    if response.analysis_stream is not None:
+        async for analysis_lines in create_text_from_analysis_stream(response.analysis_stream):
+            async for chunk in stream_text(analysis_lines):
+                await put(chunk)
+    else:
+        analysis_lines = create_text_from_analysis(sections["analysis"])
+        async for chunk in stream_text(analysis_lines):
+            await put(chunk)
+
+    # The plot renders while the analysis streams, once done its URL and the source citation go in a single write
+    visualization = await response.resolve_visualization()
+    tail = []
+    if visualization and visualization.plot:
+        tail.append(dump_line(VisualizationEvent.model_construct(
+            content=VisualizationContent.model_construct(
+                plot_url=f"/plots/{visualization.plot.filename}",
+                format=visualization.format
+            )
+        )))
+
     if response.source_info:
-        await asyncio.sleep(0.2)
-        yield json.dumps({
-            "type": "source",
-            "content": response.source_info.format_citation()
-        }) + "\n"
+        tail.append(dump_line(SourceEvent.model_construct(content=response.source_info.format_citation())))
 
+    if tail:
+        await put(b"".join(tail))
 
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="localhost", reload=True)
\ No newline at end of file
+    # uvloop and httptools come with uvicorn[standard] and replace the pure-Python event loop and HTTP parser
+    uvicorn.run("main:app", host="localhost", reload=True, loop="uvloop", http="httptools", access_log=False)
\ No newline at end of file